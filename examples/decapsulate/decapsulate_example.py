@@ -12,26 +12,65 @@ The decapsulate_code method is useful for:
 - Debugging multiaddr structures
 """
 
+import functools
 import sys
 
 from multiaddr import Multiaddr
 from multiaddr.protocols import P_IP4, P_IP6, P_TCP, P_TLS, P_UDP
 
+_BAR = "=" * 60
+_IP_CODES = frozenset((P_IP4, P_IP6))
+_WILDCARD_IPS = frozenset(("0.0.0.0", "::"))
+
+# Addresses used by the practical use cases, parsed once at import time
+CONFIGS = tuple(
+    Multiaddr(s)
+    for s in (
+        "/ip4/0.0.0.0/tcp/8080",
+        "/ip4/0.0.0.0/tcp/8080/tls",
+        "/ip6/::/tcp/8080/tls/p2p/QmNnooDu7bfjPFoTZYxMNLWUQJyrVwtbZg5gBMjTezGAJN",
+        "/ip4/192.168.1.1/udp/1234",
+    )
+)
+ADDRESSES = tuple(
+    Multiaddr(s)
+    for s in (
+        "/ip4/192.168.1.1/tcp/8080",
+        "/ip4/192.168.1.1/tcp/8080/tls",
+        "/ip6/2001:db8::1/udp/1234",
+    )
+)
+
 
 def print_separator(title):
     """Print a formatted separator with title."""
-    print(f"\n{'=' * 60}")
-    print(f" {title}")
-    print(f"{'=' * 60}")
+    print(f"\n{_BAR}\n {title}\n{_BAR}")
+
+
+@functools.lru_cache(maxsize=256)
+def _format_multiaddr(addr):
+    """Return the string form, protocol names and protocol codes of a multiaddr.
+
+    ``addr`` may be a multiaddr string or a ``Multiaddr``; both are hashable,
+    so repeated addresses are only parsed and formatted once. The cached
+    result is shared between callers, so the names and codes are tuples.
+    """
+    ma = Multiaddr(addr)
+    protos = tuple(ma.protocols())
+    return str(ma), tuple(p.name for p in protos), tuple(p.code for p in protos)
 
 
 def print_multiaddr_info(ma, description=""):
-    """Print multiaddr information in a formatted way."""
-    if description:
-        print(f"\n{description}:")
-    print(f"  String: {ma}")
-    print(f"  Protocols: {[p.name for p in ma.protocols()]}")
-    print(f"  Protocol codes: {[p.code for p in ma.protocols()]}")
+    """Print multiaddr information in a formatted way.
+
+    ``ma`` may be a ``Multiaddr`` or a multiaddr string.
+    """
+    addr_str, names, codes = _format_multiaddr(ma)
+    lines = [f"\n{description}:"] if description else []
+    lines.append(f"  String: {addr_str}")
+    lines.append(f"  Protocols: {list(names)}")
+    lines.append(f"  Protocol codes: {list(codes)}")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def basic_decapsulate_examples():
@@ -77,16 +116,16 @@ def protocol_stack_analysis():
     current = ma
     layer = 1
 
-    while str(current) != "/":
+    while True:
+        # The empty address left after the last decapsulation is the final layer
         print(f"  Layer {layer}: {current}")
         protocols = list(current.protocols())
-        if protocols:
-            # Remove the last protocol layer
-            last_protocol = protocols[-1]
-            current = current.decapsulate_code(last_protocol.code)
-            layer += 1
-        else:
+        if not protocols:
             break
+        # Remove the last protocol layer
+        last_protocol = protocols[-1]
+        current = current.decapsulate_code(last_protocol.code)
+        layer += 1
 
 
 def address_transformation():
@@ -152,42 +191,31 @@ def practical_use_cases():
 
     # Use case 1: Network configuration analysis
     print("Use Case 1: Network Configuration Analysis")
-    configs = [
-        "/ip4/0.0.0.0/tcp/8080",
-        "/ip4/0.0.0.0/tcp/8080/tls",
-        "/ip6/::/tcp/8080/tls/p2p/QmNnooDu7bfjPFoTZYxMNLWUQJyrVwtbZg5gBMjTezGAJN",
-        "/ip4/192.168.1.1/udp/1234",
-    ]
-
-    for config in configs:
-        ma = Multiaddr(config)
+    for ma in CONFIGS:
         print(f"\n  Config: {ma}")
 
         # Check if it's a server config (has wildcard IP)
-        if "0.0.0.0" in str(ma) or "::" in str(ma):
+        is_server = any(
+            value in _WILDCARD_IPS for proto, value in ma.items() if proto.code in _IP_CODES
+        )
+        if is_server:
             print("    Type: Server binding address")
             # Extract transport info
-            transport = ma.decapsulate_code(
-                P_IP4 if P_IP4 in [p.code for p in ma.protocols()] else P_IP6
-            )
+            has_ip4 = any(p.code == P_IP4 for p in ma.protocols())
+            transport = ma.decapsulate_code(P_IP4 if has_ip4 else P_IP6)
             print(f"    Transport: {transport}")
         else:
             print("    Type: Client address")
 
     # Use case 2: Protocol compatibility checking
     print("\nUse Case 2: Protocol Compatibility Checking")
-    addresses = [
-        "/ip4/192.168.1.1/tcp/8080",
-        "/ip4/192.168.1.1/tcp/8080/tls",
-        "/ip6/2001:db8::1/udp/1234",
-    ]
-
-    for addr_str in addresses:
-        ma = Multiaddr(addr_str)
+    for ma in ADDRESSES:
+        # Several membership tests follow, so build the code set only once
+        codes = frozenset(p.code for p in ma.protocols())
         print(f"\n  Address: {ma}")
 
         # Check if supports TLS
-        if P_TLS in [p.code for p in ma.protocols()]:
+        if P_TLS in codes:
             print("    TLS: Supported")
             insecure = ma.decapsulate_code(P_TLS)
             print(f"    Insecure version: {insecure}")
@@ -195,14 +223,18 @@ def practical_use_cases():
             print("    TLS: Not supported")
 
         # Check transport protocol
-        if P_TCP in [p.code for p in ma.protocols()]:
+        if P_TCP in codes:
             print("    Transport: TCP")
-        elif P_UDP in [p.code for p in ma.protocols()]:
+        elif P_UDP in codes:
             print("    Transport: UDP")
 
 
 def main():
     """Run all decapsulate_code examples."""
+    # Nothing here waits on I/O, so let stdout coalesce writes even on a
+    # terminal and flush once at exit
+    sys.stdout.reconfigure(line_buffering=False)
+
     print("Decapsulate Code Examples")
     print("Demonstrating multiaddr protocol layer manipulation")
 
@@ -13,7 +13,7 @@ This script shows various examples of DNS resolution using py-multiaddr:
 2. **Bootstrap Node Resolution**: Resolving real bootstrap node addresses with peer IDs
 3. **DNS Protocol Comparison**: Testing different DNS protocols (/dns/, /dns4/, /dns6/, /dnsaddr/)
 4. **Peer ID Preservation**: Ensuring peer IDs are maintained during resolution
-5. **Sequential Resolution**: Processing multiple addresses sequentially
+5. **Concurrent Resolution**: Processing multiple addresses concurrently
 6. **py-libp2p Integration**: Example of how to use resolved addresses with py-libp2p
 
 ## Expected Output
@@ -57,7 +57,7 @@ Resolved to 6 addresses:
      Peer ID: QmNnooDu7bfjPFoTZYxMNLWUQJyrVwtbZg5gBMjTezGAJN
      Peer ID preserved: True
 
-=== Sequential DNS Resolution ===
+=== Concurrent DNS Resolution ===
 /dns/example.com:
   Resolved to 12 addresses:
     - /ip4/23.215.0.136
@@ -104,11 +104,33 @@ python trio_dns_examples.py
 - All examples demonstrate working DNS resolution to actual IP addresses
 """
 
+import sys
+
 import trio
 
 from multiaddr import Multiaddr
 from multiaddr.resolvers import DNSResolver
 
+# One resolver shared by every example, so its nameserver configuration is
+# only loaded once per run
+_RESOLVER = DNSResolver()
+
+_BAR = "=" * 50
+
+# Use only one bootstrap address to reduce repetition; it is shared by the
+# bootstrap and py-libp2p examples and only parsed once
+_BOOTSTRAP_STR = "/dnsaddr/bootstrap.libp2p.io/p2p/QmNnooDu7bfjPFoTZYxMNLWUQJyrVwtbZg5gBMjTezGAJN"
+_BOOTSTRAP = Multiaddr(_BOOTSTRAP_STR)
+
+
+def _conn_info(ma):
+    """Return the ``(ip, tcp_port)`` pair of a resolved multiaddr.
+
+    Either element is ``None`` if the multiaddr has no such component.
+    """
+    values = {proto.name: value for proto, value in ma.items()}
+    return values.get("ip4") or values.get("ip6"), values.get("tcp")
+
 
 async def basic_dns_resolution():
     """
@@ -139,10 +161,10 @@ async def basic_dns_resolution():
     print(f"Protocols: {[p.name for p in ma.protocols()]}")
 
     try:
-        resolved = await ma.resolve()
-        print(f"Resolved to {len(resolved)} addresses:")
-        for i, addr in enumerate(resolved, 1):
-            print(f"  {i}. {addr}")
+        resolved = await _RESOLVER.resolve(ma)
+        lines = [f"Resolved to {len(resolved)} addresses:"]
+        lines.extend(f"  {i}. {addr}" for i, addr in enumerate(resolved, 1))
+        print("\n".join(lines))
     except Exception as e:
         print(f"Error resolving {test_addr}: {e}")
 
@@ -176,42 +198,29 @@ async def bootstrap_node_resolution():
     """
     print("\n=== Bootstrap Node Resolution ===")
 
-    # Use only one bootstrap address to reduce repetition
-    bootstrap_addresses = [
-        "/dnsaddr/bootstrap.libp2p.io/p2p/QmNnooDu7bfjPFoTZYxMNLWUQJyrVwtbZg5gBMjTezGAJN",
-    ]
-
-    resolver = DNSResolver()
+    addr_str = _BOOTSTRAP_STR
+    print(f"\nResolving: {addr_str}")
 
-    for addr_str in bootstrap_addresses:
-        print(f"\nResolving: {addr_str}")
-
-        try:
-            ma = Multiaddr(addr_str)
-            peer_id = ma.get_peer_id()
-            print(f"  Peer ID: {peer_id}")
+    try:
+        ma = _BOOTSTRAP
+        peer_id = ma.get_peer_id()
+        print(f"  Peer ID: {peer_id}")
 
-            # Resolve the address
-            resolved = await resolver.resolve(ma)
+        # Resolve the address
+        resolved = await _RESOLVER.resolve(ma)
 
-            print(f"  Resolved to {len(resolved)} addresses:")
-            for i, resolved_ma in enumerate(resolved, 1):
-                print(f"    {i}. {resolved_ma}")
+        print(f"  Resolved to {len(resolved)} addresses:")
+        for i, resolved_ma in enumerate(resolved, 1):
+            print(f"    {i}. {resolved_ma}")
 
-                # Extract IP and port information for TCP connections only
-                ip_addr = None
-                port = None
-                for proto, value in resolved_ma.items():
-                    if proto.name in ("ip4", "ip6"):
-                        ip_addr = value
-                    elif proto.name == "tcp":
-                        port = value
+            # Extract IP and port information for TCP connections only
+            ip_addr, port = _conn_info(resolved_ma)
 
-                if ip_addr and port:
-                    print(f"       Connection: {ip_addr}:{port}")
+            if ip_addr and port:
+                print(f"       Connection: {ip_addr}:{port}")
 
-        except Exception as e:
-            print(f"  Error: {e}")
+    except Exception as e:
+        print(f"  Error: {e}")
 
 
 async def dns_protocol_comparison():
@@ -253,21 +262,19 @@ async def dns_protocol_comparison():
         ("/dnsaddr/bootstrap.libp2p.io", "DNSADDR (both IPv4 and IPv6)"),
     ]
 
-    resolver = DNSResolver()
-
     for addr_str, description in dns_tests:
         print(f"\nTesting {description}: {addr_str}")
 
         try:
             ma = Multiaddr(addr_str)
-            resolved = await resolver.resolve(ma)
+            resolved = await _RESOLVER.resolve(ma)
 
-            print(f"  Resolved to {len(resolved)} addresses:")
+            lines = [f"  Resolved to {len(resolved)} addresses:"]
             # Show only first 3 addresses to reduce repetition
-            for i, addr in enumerate(resolved[:3], 1):
-                print(f"    {i}. {addr}")
+            lines.extend(f"    {i}. {addr}" for i, addr in enumerate(resolved[:3], 1))
             if len(resolved) > 3:
-                print(f"    ... and {len(resolved) - 3} more addresses")
+                lines.append(f"    ... and {len(resolved) - 3} more addresses")
+            print("\n".join(lines))
 
         except Exception as e:
             print(f"  Error: {e}")
@@ -295,15 +302,13 @@ async def peer_id_preservation_test():
     """
     print("\n=== Peer ID Preservation Test ===")
 
-    test_addr = "/dnsaddr/bootstrap.libp2p.io/p2p/QmNnooDu7bfjPFoTZYxMNLWUQJyrVwtbZg5gBMjTezGAJN"
-
     try:
-        ma = Multiaddr(test_addr)
+        ma = _BOOTSTRAP
         original_peer_id = ma.get_peer_id()
         print(f"Original address: {ma}")
         print(f"Original peer ID: {original_peer_id}")
 
-        resolved = await ma.resolve()
+        resolved = await _RESOLVER.resolve(ma)
 
         print(f"Resolved to {len(resolved)} addresses:")
         # Show only first 2 addresses to reduce repetition
@@ -322,15 +327,15 @@ async def peer_id_preservation_test():
 
 async def concurrent_resolution():
     """
-    Demonstrate sequential DNS resolution.
+    Demonstrate concurrent DNS resolution.
 
-    This function shows how to process multiple DNS addresses sequentially:
-    - Resolves multiple addresses one by one
+    This function shows how to process multiple DNS addresses concurrently:
+    - Resolves all addresses at once in a trio nursery
     - Handles errors gracefully for each address
     - Shows the results for each resolution attempt
 
     Expected output:
-    === Sequential DNS Resolution ===
+    === Concurrent DNS Resolution ===
     /dns/example.com:
       Resolved to 12 addresses:
         - /ip4/23.215.0.136
@@ -349,7 +354,7 @@ async def concurrent_resolution():
         - /ip6/2600:1406:3a00:21::173e:2e65
         ... (IPv6 addresses only)
     """
-    print("\n=== Sequential DNS Resolution ===")
+    print("\n=== Concurrent DNS Resolution ===")
 
     addresses = [
         "/dns/example.com",
@@ -362,28 +367,32 @@ async def concurrent_resolution():
         """Resolve a single address."""
         try:
             ma = Multiaddr(addr_str)
-            resolved = await ma.resolve()
+            resolved = await _RESOLVER.resolve(ma)
             return addr_str, resolved, None
         except Exception as e:
             return addr_str, [], str(e)
 
-    # Resolve all addresses sequentially
-    results = []
-    for addr in addresses:
-        result = await resolve_single(addr)
-        results.append(result)
+    # Resolve all addresses concurrently, keeping results in input order
+    results = [None] * len(addresses)
+
+    async def run(i, addr_str):
+        results[i] = await resolve_single(addr_str)
+
+    async with trio.open_nursery() as nursery:
+        for i, addr in enumerate(addresses):
+            nursery.start_soon(run, i, addr)
 
     for addr_str, resolved, error in results:
         print(f"\n{addr_str}:")
         if error:
             print(f"  Error: {error}")
         else:
-            print(f"  Resolved to {len(resolved)} addresses:")
+            lines = [f"  Resolved to {len(resolved)} addresses:"]
             # Show only first 3 addresses to reduce repetition
-            for addr in resolved[:3]:
-                print(f"    - {addr}")
+            lines.extend(f"    - {addr}" for addr in resolved[:3])
             if len(resolved) > 3:
-                print(f"    ... and {len(resolved) - 3} more addresses")
+                lines.append(f"    ... and {len(resolved) - 3} more addresses")
+            print("\n".join(lines))
 
 
 async def py_libp2p_integration_example():
@@ -406,52 +415,36 @@ async def py_libp2p_integration_example():
     """
     print("\n=== py-libp2p Integration Example ===")
 
-    resolver = DNSResolver()
+    resolved_peers = []
 
-    # Use only one bootstrap address to reduce repetition
-    bootstrap_addresses = [
-        "/dnsaddr/bootstrap.libp2p.io/p2p/QmNnooDu7bfjPFoTZYxMNLWUQJyrVwtbZg5gBMjTezGAJN",
-    ]
+    addr_str = _BOOTSTRAP_STR
+    ma = _BOOTSTRAP
+    peer_id = ma.get_peer_id()
 
-    resolved_peers = []
+    print(f"\nProcessing bootstrap node: {peer_id}")
 
-    for addr_str in bootstrap_addresses:
-        ma = Multiaddr(addr_str)
-        peer_id = ma.get_peer_id()
+    try:
+        # Resolve DNS addresses to IP addresses
+        resolved_addrs = await _RESOLVER.resolve(ma)
 
-        print(f"\nProcessing bootstrap node: {peer_id}")
+        for resolved_ma in resolved_addrs:
+            # Extract connection information
+            ip_addr, port = _conn_info(resolved_ma)
 
-        try:
-            # Resolve DNS addresses to IP addresses
-            resolved_addrs = await resolver.resolve(ma)
-
-            for resolved_ma in resolved_addrs:
-                # Extract connection information
-                ip_addr = None
-                port = None
-
-                for proto, value in resolved_ma.items():
-                    if proto.name == "ip4":
-                        ip_addr = value
-                    elif proto.name == "ip6":
-                        ip_addr = value
-                    elif proto.name == "tcp":
-                        port = value
-
-                if ip_addr and port and peer_id:
-                    peer_info = {
-                        "peer_id": peer_id,
-                        "ip_addr": ip_addr,
-                        "port": port,
-                        "original_addr": str(ma),
-                        "resolved_addr": str(resolved_ma),
-                    }
-                    resolved_peers.append(peer_info)
-
-                    print(f"  Resolved: {ip_addr}:{port} (peer: {peer_id})")
+            if ip_addr and port and peer_id:
+                peer_info = {
+                    "peer_id": peer_id,
+                    "ip_addr": ip_addr,
+                    "port": port,
+                    "original_addr": addr_str,
+                    "resolved_addr": str(resolved_ma),
+                }
+                resolved_peers.append(peer_info)
 
-        except Exception as e:
-            print(f"  Error resolving {addr_str}: {e}")
+                print(f"  Resolved: {ip_addr}:{port} (peer: {peer_id})")
+
+    except Exception as e:
+        print(f"  Error resolving {addr_str}: {e}")
 
     print(f"\nResolved {len(resolved_peers)} bootstrap peers:")
     for peer in resolved_peers:
@@ -469,24 +462,32 @@ async def main():
     2. Bootstrap node resolution
     3. DNS protocol comparison
     4. Peer ID preservation test
-    5. Sequential resolution
+    5. Concurrent resolution
     6. py-libp2p integration example
 
     Each example demonstrates different aspects of DNS resolution functionality
     and shows how to use it with py-multiaddr.
     """
+    # Let stdout coalesce writes even on a terminal; each example section is
+    # flushed as a whole once it has finished
+    sys.stdout.reconfigure(line_buffering=False)
+
     print("DNS Resolution Examples")
-    print("=" * 50)
+    print(_BAR)
 
     try:
-        await basic_dns_resolution()
-        await bootstrap_node_resolution()
-        await dns_protocol_comparison()
-        await peer_id_preservation_test()
-        await concurrent_resolution()
-        await py_libp2p_integration_example()
-
-        print("\n" + "=" * 50)
+        for example in (
+            basic_dns_resolution,
+            bootstrap_node_resolution,
+            dns_protocol_comparison,
+            peer_id_preservation_test,
+            concurrent_resolution,
+            py_libp2p_integration_example,
+        ):
+            await example()
+            sys.stdout.flush()
+
+        print("\n" + _BAR)
         print("All examples completed!")
         print("\nSummary:")
         print("- DNS resolution is working correctly")
@@ -28,25 +28,35 @@ ADDRESSES = [
     "/dnsaddr/cloudflare.com/p2p/QmNnooDu7bfjPFoTZYxMNLWUQJyrVwtbZg5gBMjTezGAJN",
     "/dnsaddr/google.com/p2p/QmNnooDu7bfjPFoTZYxMNLWUQJyrVwtbZg5gBMjTezGAJN",
 ]
+PARSED = [Multiaddr(addr) for addr in ADDRESSES]
 
 
 async def main():
     resolver = DNSResolver()
-    for addr in ADDRESSES:
-        print(f"\nResolving: {addr}")
-        ma = Multiaddr(addr)
+    results = [None] * len(PARSED)
+
+    async def run(i, ma):
         try:
-            resolved = await resolver.resolve(ma)
-            if resolved:
-                for r in resolved:
-                    print(f"  -> {r}")
-            else:
-                # If DNSADDR resolution fails (no TXT records or no matching entries),
-                # the result is an empty list (no resolution results), matching the JS
-                # implementation and spec.
-                print("  (No resolution results)")
+            results[i] = await resolver.resolve(ma)
         except Exception as e:
-            print(f"  (Error: {e})")
+            results[i] = e
+
+    # Resolve all addresses concurrently, then print in input order
+    async with trio.open_nursery() as nursery:
+        for i, ma in enumerate(PARSED):
+            nursery.start_soon(run, i, ma)
+
+    for ma, resolved in zip(PARSED, results):
+        print(f"\nResolving: {ma}")
+        if isinstance(resolved, Exception):
+            print(f"  (Error: {resolved})")
+        elif resolved:
+            print("\n".join(f"  -> {r}" for r in resolved))
+        else:
+            # If DNSADDR resolution fails (no TXT records or no matching entries),
+            # the result is an empty list (no resolution results), matching the JS
+            # implementation and spec.
+            print("  (No resolution results)")
 
 
 if __name__ == "__main__":
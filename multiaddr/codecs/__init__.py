@@ -1,5 +1,5 @@
 import importlib
-from typing import Any, Dict, Union
+from typing import Any, Dict, Optional, Union
 
 # These are special sizes
 LENGTH_PREFIXED_VAR_SIZE = -1
@@ -15,6 +15,17 @@ class CodecBase:
     def to_bytes(self, proto: Any, string: str) -> bytes:
         raise NotImplementedError
 
+    def validate(self, proto: Any, string: str) -> Optional[Exception]:
+        """Return the error to_bytes() raises for *string*, or None if it is valid.
+
+        Codecs can override this with a check that skips building the bytes.
+        """
+        try:
+            self.to_bytes(proto, string)
+        except Exception as exc:
+            return exc
+        return None
+
 
 class NoneCodec(CodecBase):
     SIZE: int = 0
@@ -28,11 +39,12 @@ class NoneCodec(CodecBase):
 
 
 CODEC_CACHE: Dict[str, CodecBase] = {}
+_NONE_CODEC = NoneCodec()
 
 
 def codec_by_name(name: Union[str, None]) -> CodecBase:
     if name is None:  # Special "do nothing - expect nothing" pseudo-codec
-        return NoneCodec()
+        return _NONE_CODEC
     codec = CODEC_CACHE.get(name)
     if codec is None:
         module = importlib.import_module(f".{name}", __name__)
@@ -1,70 +1,25 @@
+import functools
 import logging
+from typing import TYPE_CHECKING, Union
 
 import base58
-import cid
 
 from ..codecs import CodecBase
 from ..exceptions import BinaryParseError
 from . import LENGTH_PREFIXED_VAR_SIZE
 
+if TYPE_CHECKING:
+    import cid
+
 logger = logging.getLogger(__name__)
 
 SIZE = LENGTH_PREFIXED_VAR_SIZE
 IS_PATH = False
 
 
-# Spec: https://github.com/libp2p/specs/blob/master/peer-ids/peer-ids.md#string-representation
-CIDv0_PREFIX_TO_LENGTH: dict[str, list[int]] = {
-    # base58btc prefixes for valid lengths 1 - 42 with the identity "hash" function
-    "12": [5, 12, 19, 23, 30, 41, 52, 56],
-    "13": [9, 16, 34, 45],
-    "14": [27, 38, 49, 60],
-    "15": [3, 6, 20],
-    "16": [3, 6, 13, 20, 31, 42, 53],
-    "17": [3, 13, 42],
-    "18": [3],
-    "19": [3, 24, 57],
-    "1A": [24, 35, 46],
-    "1B": [35],
-    "1D": [17],
-    "1E": [10, 17],
-    "1F": [10],
-    "1G": [10, 28, 50],
-    "1H": [28, 39],
-    "1P": [21],
-    "1Q": [21],
-    "1R": [21, 54],
-    "1S": [54],
-    "1T": [7, 32, 43],
-    "1U": [7, 32, 43],
-    "1V": [7],
-    "1W": [7, 14],
-    "1X": [7, 14],
-    "1Y": [7, 14],
-    "1Z": [7, 14],
-    "1f": [4],
-    "1g": [4, 58],
-    "1h": [4, 25, 58],
-    "1i": [4, 25],
-    "1j": [4, 25],
-    "1k": [4, 25, 47],
-    "1m": [4, 36, 47],
-    "1n": [4, 36],
-    "1o": [4, 36],
-    "1p": [4],
-    "1q": [4],
-    "1r": [4],
-    "1s": [4],
-    "1t": [4],
-    "1u": [4],
-    "1v": [4],
-    "1w": [4],
-    "1x": [4],
-    "1y": [4],
-    "1z": [4, 18],
-    # base58btc prefix for length 42 with the sha256 hash function
-    "Qm": [46],
-}
+# A base58btc CIDv0 is either an identity multihash, whose leading zero byte
+# encodes as "1", or a sha2-256 multihash, which always encodes to "Qm..."
+_CIDV0_LEADING = ("1", "Qm")
 
 PROTO_NAME_TO_CIDv1_CODEC = {
     "p2p": "libp2p-key",
@@ -73,20 +28,42 @@ PROTO_NAME_TO_CIDv1_CODEC = {
 
 
 def _is_binary_cidv0_multihash(buf: bytes) -> bool:
-    """Check if the given bytes represent a CIDv0 multihash."""
-    try:
-        # CIDv0 is just a base58btc encoded multihash
-        # The first byte is the hash function code, second byte is the length
-        if len(buf) < 2:
-            return False
-        hash_code = buf[0]
-        length = buf[1]
-        if len(buf) != length + 2:  # +2 for the hash code and length bytes
-            return False
-        # For CIDv0, we only support sha2-256 (0x12) and identity (0x00)
-        return hash_code in (0x12, 0x00)
-    except Exception:
+    """Check if the given bytes represent a CIDv0 multihash.
+
+    This is a purely structural check on the multihash header: either a
+    sha2-256 hash (0x12) with its fixed 32 byte digest, or an identity
+    "hash" (0x00) whose length byte covers the rest of the buffer.
+    """
+    if len(buf) < 2:
         return False
+    if buf[0] == 0x12:
+        return buf[1] == 0x20 and len(buf) == 34
+    return buf[0] == 0x00 and len(buf) == buf[1] + 2
+
+
+# Peer IDs and content IDs recur constantly (peerstores, DHT routing tables),
+# so the parsed forms are memoized. CID objects are never mutated here.
+#
+# The py-cid package (and the multibase/multihash stack behind it) is only
+# needed for CIDv1, so it is imported on first use; CIDv0 peer IDs only need
+# base58.
+@functools.lru_cache(maxsize=4096)
+def _make_cid(string: str) -> Union["cid.CIDv0", "cid.CIDv1"]:
+    import cid
+
+    return cid.make_cid(string)
+
+
+@functools.lru_cache(maxsize=4096)
+def _cid_from_bytes(buf: bytes) -> Union["cid.CIDv0", "cid.CIDv1"]:
+    import cid
+
+    return cid.from_bytes(buf)
+
+
+@functools.lru_cache(maxsize=4096)
+def _encode_cidv1_base32(buf: bytes) -> str:
+    return _cid_from_bytes(buf).encode("base32").decode("ascii")
 
 
 class Codec(CodecBase):
@@ -98,51 +75,49 @@ class Codec(CodecBase):
         if not string:
             raise ValueError("CID string cannot be empty")
 
-        logger.debug(f"[DEBUG CID to_bytes] Input value: {string}")
-
-        # First try to parse as CIDv0 (base58btc encoded multihash)
-        try:
-            decoded = base58.b58decode(string)
-            if _is_binary_cidv0_multihash(decoded):
-                logger.debug(f"[DEBUG CID to_bytes] Parsed as CIDv0: {decoded.hex()}")
-                # Do not add length prefix here; the framework handles it
-                return decoded
-        except Exception as e:
-            logger.debug(f"[DEBUG CID to_bytes] Failed to parse as CIDv0: {e}")
+        # First try to parse as CIDv0 (base58btc encoded multihash). No multibase
+        # prefix is "1" or "Q", so such a string can never be a CIDv1 and one
+        # base58 decode settles it either way.
+        if string.startswith(_CIDV0_LEADING):
+            try:
+                decoded = base58.b58decode(string)
+            except Exception as e:
+                logger.debug("[DEBUG CID to_bytes] Failed to parse as CIDv0: %s", e)
+                raise ValueError(f"Invalid CID: {string}")
+            if not _is_binary_cidv0_multihash(decoded):
+                raise ValueError(f"Invalid CID: {string}")
+            # Do not add length prefix here; the framework handles it
+            return decoded
 
         # If not CIDv0, try to parse as CIDv1
         try:
-            parsed = cid.make_cid(string)
+            parsed = _make_cid(string)
 
             # Do not add length prefix here; the framework handles it
             if not isinstance(parsed.buffer, bytes):
                 raise ValueError("CID buffer must be bytes")
             return parsed.buffer
         except ValueError as e:
-            logger.debug(f"[DEBUG CID to_bytes] Failed to parse as CIDv1: {e}")
+            logger.debug("[DEBUG CID to_bytes] Failed to parse as CIDv1: %s", e)
             raise ValueError(f"Invalid CID: {string}")
 
     def to_string(self, proto, buf: bytes) -> str:
         """Convert a binary CID to its string representation."""
         if not buf:
             raise ValueError("CID buffer cannot be empty")
-
-        logger.debug(f"[DEBUG CID to_string] Input buffer: {buf.hex()}")
-        logger.debug(f"[DEBUG CID to_string] Protocol: {proto.name}")
+        # The parse caches are keyed on the buffer, so it has to be hashable
+        buf = bytes(buf)
 
         expected_codec = PROTO_NAME_TO_CIDv1_CODEC.get(proto.name)
-        logger.debug(f"[DEBUG CID to_string] Expected codec: {expected_codec}")
 
         try:
             # First try to parse as CIDv0
             if _is_binary_cidv0_multihash(buf):
                 result = base58.b58encode(buf).decode("ascii")
-                logger.debug(f"[DEBUG CID to_string] Parsed as CIDv0: {result}")
                 return result
 
             # If not CIDv0, try to parse as CIDv1
-            parsed = cid.from_bytes(buf)
-            logger.debug(f"[DEBUG CID to_string] Parsed as CIDv1: {parsed}")
+            parsed = _cid_from_bytes(buf)
 
             # Ensure CID has correct codec for protocol
             if expected_codec and parsed.codec != expected_codec:
@@ -158,19 +133,16 @@ class Codec(CodecBase):
                 try:
                     # Extract the multihash bytes
                     multihash = parsed.multihash
-                    logger.debug(f"[DEBUG CID to_string] Extracted multihash: {multihash.hex()}")
                     # Check if it's a valid CIDv0 multihash
                     if _is_binary_cidv0_multihash(multihash):
                         result = base58.b58encode(multihash).decode("ascii")
-                        logger.debug(f"[DEBUG CID to_string] Converted to CIDv0: {result}")
                         return result
                 except Exception as e:
-                    logger.debug(f"[DEBUG CID to_string] Failed to convert to CIDv0: {e}")
+                    logger.debug("[DEBUG CID to_string] Failed to convert to CIDv0: %s", e)
 
             # If we can't convert to CIDv0, use base32 CIDv1 format
-            result = parsed.encode("base32").decode("ascii")
-            logger.debug(f"[DEBUG CID to_string] Using CIDv1 format: {result}")
+            result = _encode_cidv1_base32(buf)
             return result
         except Exception as e:
-            logger.debug(f"[DEBUG CID to_string] Error: {e}")
+            logger.debug("[DEBUG CID to_string] Error: %s", e)
             raise BinaryParseError(str(e), buf, proto.name, e) from e
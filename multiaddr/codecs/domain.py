@@ -1,3 +1,5 @@
+import re
+
 import idna
 
 from ..exceptions import BinaryParseError
@@ -6,6 +8,16 @@ from . import LENGTH_PREFIXED_VAR_SIZE, CodecBase
 SIZE = LENGTH_PREFIXED_VAR_SIZE  # Variable size for length-prefixed values
 IS_PATH = False
 
+# Plain ASCII letter-digit-hyphen names, which IDNA always accepts. Labels with
+# hyphens in the 3rd and 4th position (including "xn--" A-labels) are excluded
+# so that IDNA still gets to check them.
+_LDH_LABEL = r"(?!-)(?![A-Za-z0-9-]{2}--)[A-Za-z0-9-]{1,63}(?<!-)"
+_LDH_NAME = re.compile(rf"(?:{_LDH_LABEL}\.)*{_LDH_LABEL}")
+
+
+def _is_ldh_name(name: str) -> bool:
+    return len(name) <= 253 and _LDH_NAME.fullmatch(name) is not None
+
 
 class Codec(CodecBase):
     SIZE = SIZE
@@ -18,7 +30,8 @@ class Codec(CodecBase):
             raise ValueError("Domain name cannot be empty")
         try:
             # Validate using IDNA, but store as UTF-8
-            idna.encode(string, uts46=True)
+            if not _is_ldh_name(string):
+                idna.encode(string, uts46=True)
             return string.encode("utf-8")
         except idna.IDNAError as e:
             raise ValueError(f"Invalid domain name: {e!s}")
@@ -31,7 +44,8 @@ class Codec(CodecBase):
         try:
             value = buf.decode("utf-8")
             # Validate using IDNA
-            idna.encode(value, uts46=True)
+            if not _is_ldh_name(value):
+                idna.encode(value, uts46=True)
             return value
         except (UnicodeDecodeError, idna.IDNAError) as e:
             raise BinaryParseError(f"Invalid domain name encoding: {e!s}", buf, proto.name, e)
@@ -39,12 +53,14 @@ class Codec(CodecBase):
 
 def to_bytes(proto, string):
     # Validate using IDNA, but store as UTF-8
-    idna.encode(string, uts46=True)
+    if not _is_ldh_name(string):
+        idna.encode(string, uts46=True)
     return string.encode("utf-8")
 
 
 def to_string(proto, buf):
     string = buf.decode("utf-8")
     # Validate using IDNA
-    idna.encode(string, uts46=True)
+    if not _is_ldh_name(string):
+        idna.encode(string, uts46=True)
     return string
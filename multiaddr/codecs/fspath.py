@@ -1,14 +1,15 @@
-import logging
+import re
 import urllib.parse
 
 from ..exceptions import BinaryParseError
 from . import LENGTH_PREFIXED_VAR_SIZE, CodecBase
 
-logger = logging.getLogger(__name__)
-
 SIZE = LENGTH_PREFIXED_VAR_SIZE
 IS_PATH = True
 
+# Characters that urllib.parse.quote() would escape with its default safe="/"
+_NEEDS_QUOTE = re.compile(r"[^A-Za-z0-9_.\-~/]")
+
 
 class Codec(CodecBase):
     SIZE = SIZE
@@ -16,7 +17,6 @@ class Codec(CodecBase):
 
     def to_bytes(self, proto, string: str) -> bytes:
         """Convert a filesystem path to its binary representation."""
-        logger.debug(f"[DEBUG fspath.to_bytes] input value: {string}")
         if not string:
             raise ValueError("Path cannot be empty")
 
@@ -31,23 +31,21 @@ class Codec(CodecBase):
             raise ValueError("Path cannot be empty after normalization")
 
         # URL decode to handle special characters
-        string = urllib.parse.unquote(string)
+        if "%" in string:
+            string = urllib.parse.unquote(string)
 
         # Encode as UTF-8
         encoded = string.encode("utf-8")
-        logger.debug(f"[DEBUG fspath.to_bytes] encoded bytes: {encoded}")
         return encoded
 
     def to_string(self, proto, buf: bytes) -> str:
         """Convert a binary filesystem path to its string representation."""
-        logger.debug(f"[DEBUG fspath.to_string] input bytes: {buf}")
         if not buf:
             raise ValueError("Path buffer cannot be empty")
 
         try:
             # Decode from UTF-8
             value = buf.decode("utf-8")
-            logger.debug(f"[DEBUG fspath.to_string] decoded value: {value}")
 
             # Normalize path separators
             value = value.replace("\\", "/")
@@ -60,8 +58,7 @@ class Codec(CodecBase):
                 raise ValueError("Path cannot be empty after normalization")
 
             # URL encode special characters
-            result = urllib.parse.quote(value)
-            logger.debug(f"[DEBUG fspath.to_string] output string: {result}")
+            result = urllib.parse.quote(value) if _NEEDS_QUOTE.search(value) else value
 
             # Add leading slash for Unix socket paths
             if proto.name == "unix":
@@ -1,4 +1,4 @@
-import netaddr
+import socket
 
 from ..codecs import CodecBase
 
@@ -11,7 +11,10 @@ class Codec(CodecBase):
     IS_PATH = IS_PATH
 
     def to_bytes(self, proto, string):
-        return netaddr.IPAddress(string, version=6).packed
+        try:
+            return socket.inet_pton(socket.AF_INET6, string)
+        except OSError:
+            raise ValueError(f"invalid IPv6 address: {string}")
 
     def to_string(self, proto, buf):
-        return str(netaddr.IPAddress(int.from_bytes(buf, byteorder='big'), version=6))
+        return socket.inet_ntop(socket.AF_INET6, buf)
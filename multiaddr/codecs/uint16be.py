@@ -1,8 +1,12 @@
+import struct
+
 from ..codecs import CodecBase
 
 SIZE = 16
 IS_PATH = False
 
+_U16 = struct.Struct(">H")
+
 
 class Codec(CodecBase):
     SIZE = SIZE
@@ -15,9 +19,18 @@ class Codec(CodecBase):
             raise ValueError("invalid base 10 integer")
         if n < 0 or n >= 65536:
             raise ValueError("integer not in range [0, 65536)")
-        return n.to_bytes(2, byteorder='big')
+        return _U16.pack(n)
+
+    def validate(self, proto, string):
+        try:
+            n = int(string, 10)
+        except ValueError:
+            return ValueError("invalid base 10 integer")
+        if n < 0 or n >= 65536:
+            return ValueError("integer not in range [0, 65536)")
+        return None
 
     def to_string(self, proto, buf):
         if len(buf) != 2:
             raise ValueError("buffer length must be 2 bytes")
-        return str(int.from_bytes(buf, byteorder='big'))
+        return str(_U16.unpack(buf)[0])
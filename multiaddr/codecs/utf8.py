@@ -1,8 +1,12 @@
+import re
 import urllib.parse
 
 from ..exceptions import BinaryParseError
 from . import CodecBase
 
+# Characters that urllib.parse.quote(value, safe="%") would escape
+_NEEDS_QUOTE = re.compile(r"[^A-Za-z0-9_.\-~%]")
+
 
 class Codec(CodecBase):
     SIZE = 0  # Variable size
@@ -20,7 +24,8 @@ class Codec(CodecBase):
                 raise ValueError("Zone identifier cannot be empty after stripping whitespace")
         else:
             # URL decode the string to handle special characters for other protocols
-            string = urllib.parse.unquote(string)
+            if "%" in string:
+                string = urllib.parse.unquote(string)
 
         # Encode as UTF-8
         encoded = string.encode("utf-8")
@@ -43,6 +48,8 @@ class Codec(CodecBase):
                     raise ValueError("Zone identifier cannot be empty after stripping whitespace")
                 return value
             # For other protocols, URL encode special characters
-            return urllib.parse.quote(value, safe="%")
+            if _NEEDS_QUOTE.search(value):
+                return urllib.parse.quote(value, safe="%")
+            return value
         except UnicodeDecodeError as e:
             raise BinaryParseError(f"Invalid UTF-8 encoding: {e!s}", buf, proto.name, e)
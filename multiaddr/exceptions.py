@@ -43,7 +43,7 @@ class StringParseError(ParseError):
         self.original = original
 
         if protocol:
-            message = "Invalid MultiAddr {!r} protocol {}: {}".format(string, protocol, message)
+            message = f"Invalid MultiAddr {string!r} protocol {protocol}: {message}"
         else:
             message = f"Invalid MultiAddr {string!r}: {message}"
 
@@ -1,13 +1,12 @@
 import collections.abc
+import socket
 from collections.abc import Iterator, Sequence
 from typing import Any, Optional, TypeVar, Union, overload
 
-import varint
-
 from . import exceptions, protocols
 from .codecs import codec_by_name
-from .protocols import protocol_with_name
-from .transforms import bytes_iter, bytes_to_string
+from .protocols import _protocol_with_name_or_none, protocol_with_name
+from .transforms import _write_varint, _write_varint_into, bytes_iter, bytes_to_string
 
 __all__ = ("Multiaddr",)
 
@@ -26,19 +25,20 @@ class MultiAddrKeys(collections.abc.KeysView[Any], collections.abc.Sequence[Any]
 
     def __getitem__(self, idx: Union[int, slice]) -> Union[Any, Sequence[Any]]:
         if isinstance(idx, slice):
-            return list(self)[idx]
-        if idx < 0:
-            idx = len(self) + idx
-        for idx2, proto in enumerate(self):
-            if idx2 == idx:
-                return proto
-        raise IndexError("Protocol list index out of range")
+            return [proto for _, proto, _, _ in self._mapping._components()[idx]]
+        try:
+            return self._mapping._components()[idx][1]
+        except IndexError:
+            raise IndexError("Protocol list index out of range") from None
 
     def __hash__(self) -> int:
         return hash(tuple(self))
 
+    def __length_hint__(self) -> int:
+        return len(self._mapping._components())
+
     def __iter__(self) -> Iterator[Any]:
-        for _, proto, _, _ in bytes_iter(self._mapping.to_bytes()):
+        for _, proto, _, _ in self._mapping._components():
             yield proto
 
 
@@ -66,31 +66,38 @@ class MultiAddrItems(
         self, idx: Union[int, slice]
     ) -> Union[tuple[Any, Any], Sequence[tuple[Any, Any]]]:
         if isinstance(idx, slice):
-            return list(self)[idx]
-        if idx < 0:
-            idx = len(self) + idx
-        for idx2, item in enumerate(self):
-            if idx2 == idx:
-                return item
-        raise IndexError("Protocol item list index out of range")
+            return [
+                self._decode(proto, codec, part)
+                for _, proto, codec, part in self._mapping._components()[idx]
+            ]
+        try:
+            _, proto, codec, part = self._mapping._components()[idx]
+        except IndexError:
+            raise IndexError("Protocol item list index out of range") from None
+        return self._decode(proto, codec, part)
+
+    def __length_hint__(self) -> int:
+        return len(self._mapping._components())
 
     def __iter__(self) -> Iterator[tuple[Any, Any]]:
-        for _, proto, codec, part in bytes_iter(self._mapping.to_bytes()):
-            if codec.SIZE != 0:
-                try:
-                    # If we have an address, return it
-                    yield proto, codec.to_string(proto, part)
-                except Exception as exc:
-                    raise exceptions.BinaryParseError(
-                        str(exc),
-                        self._mapping.to_bytes(),
-                        proto.name,
-                        exc,
-                    ) from exc
-            else:
-                # We were given something like '/utp', which doesn't have
-                # an address, so return None
-                yield proto, None
+        for _, proto, codec, part in self._mapping._components():
+            yield self._decode(proto, codec, part)
+
+    def _decode(self, proto: Any, codec: Any, part: bytes) -> tuple[Any, Any]:
+        if codec.SIZE == 0:
+            # We were given something like '/utp', which doesn't have
+            # an address, so return None
+            return proto, None
+        try:
+            # If we have an address, return it
+            return proto, codec.to_string(proto, part)
+        except Exception as exc:
+            raise exceptions.BinaryParseError(
+                str(exc),
+                self._mapping._bytes,
+                proto.name,
+                exc,
+            ) from exc
 
 
 class MultiAddrValues(collections.abc.ValuesView[Any], collections.abc.Sequence[Any]):
@@ -102,14 +109,16 @@ class MultiAddrValues(collections.abc.ValuesView[Any], collections.abc.Sequence[
         return collections.abc.Sequence.__contains__(self, value)
 
     def __getitem__(self, idx: Union[int, slice]) -> Union[Any, Sequence[Any]]:
+        items = MultiAddrItems(self._mapping)
         if isinstance(idx, slice):
-            return list(self)[idx]
-        if idx < 0:
-            idx = len(self) + idx
-        for idx2, value in enumerate(self):
-            if idx2 == idx:
-                return value
-        raise IndexError("Protocol value list index out of range")
+            return [value for _, value in items[idx]]
+        try:
+            return items[idx][1]
+        except IndexError:
+            raise IndexError("Protocol value list index out of range") from None
+
+    def __length_hint__(self) -> int:
+        return len(self._mapping._components())
 
     def __iter__(self) -> Iterator[Any]:
         for _, value in MultiAddrItems(self._mapping):
@@ -133,7 +142,7 @@ class Multiaddr(collections.abc.Mapping[Any, Any]):
     return new objects rather than modify internal state.
     """
 
-    __slots__ = ("_bytes", "registry")
+    __slots__ = ("_bytes", "_parsed", "registry")
 
     def __init__(
         self, addr: Union[str, bytes, "Multiaddr"], *, registry: Any = protocols.REGISTRY
@@ -145,12 +154,15 @@ class Multiaddr(collections.abc.Mapping[Any, Any]):
 
         """
         self.registry = registry
+        self._parsed: Optional[tuple[tuple[int, Any, Any, bytes], ...]] = None
         if isinstance(addr, str):
             self._from_string(addr)
         elif isinstance(addr, bytes):
             self._from_bytes(addr)
         elif isinstance(addr, Multiaddr):
-            self._bytes = addr.to_bytes()
+            # Both attributes are immutable, so the copy can share them
+            self._bytes = addr._bytes
+            self._parsed = addr._parsed
         else:
             raise TypeError("MultiAddr must be bytes, str or another MultiAddr instance")
 
@@ -158,7 +170,42 @@ class Multiaddr(collections.abc.Mapping[Any, Any]):
     def join(cls, *addrs: Union[str, bytes, "Multiaddr"]) -> "Multiaddr":
         """Concatenate the values of the given MultiAddr strings or objects,
         encapsulating each successive MultiAddr value with the previous ones."""
-        return cls(b"".join(map(lambda a: cls(a).to_bytes(), addrs)))
+        parts = []
+        for addr in addrs:
+            # Only strings need parsing; bytes and Multiaddrs are used as they are
+            if isinstance(addr, Multiaddr):
+                parts.append(addr._bytes)
+            elif isinstance(addr, bytes):
+                parts.append(addr)
+            else:
+                parts.append(cls(addr)._bytes)
+        return cls(b"".join(parts))
+
+    @classmethod
+    def from_ip_tuple(cls, family: int, ip: str) -> "Multiaddr":
+        """Build an /ip4 or /ip6 Multiaddr from an address family and an IP string.
+
+        The address is packed directly instead of going through the string
+        parser, which makes this cheaper than ``Multiaddr(f"/ip4/{ip}")``.
+
+        Args:
+            family: ``socket.AF_INET`` or ``socket.AF_INET6``
+            ip: The textual IP address
+
+        Raises:
+            ValueError: If the family is unsupported or the address is invalid.
+        """
+        if family == socket.AF_INET:
+            code = protocols.P_IP4
+        elif family == socket.AF_INET6:
+            code = protocols.P_IP6
+        else:
+            raise ValueError(f"Unsupported address family: {family}")
+        try:
+            packed = socket.inet_pton(family, ip)
+        except OSError as exc:
+            raise ValueError(f"Invalid IP address: {ip}") from exc
+        return cls(_write_varint(code) + packed)
 
     def __eq__(self, other: Any) -> bool:
         """Checks if two Multiaddr objects are exactly equal."""
@@ -180,7 +227,7 @@ class Multiaddr(collections.abc.Mapping[Any, Any]):
         return iter(MultiAddrKeys(self))
 
     def __len__(self) -> int:
-        return sum(1 for _ in bytes_iter(self.to_bytes()))
+        return len(self._components())
 
     def __repr__(self) -> str:
         return "<Multiaddr %s>" % str(self)
@@ -192,6 +239,17 @@ class Multiaddr(collections.abc.Mapping[Any, Any]):
         """Returns the byte array representation of this Multiaddr."""
         return self._bytes
 
+    def _components(self) -> tuple[tuple[int, Any, Any, bytes], ...]:
+        """Return the parsed ``(offset, proto, codec, part)`` components.
+
+        The binary representation never changes after construction, so it is
+        only parsed the first time this is needed.
+        """
+        parsed = self._parsed
+        if parsed is None:
+            parsed = self._parsed = tuple(bytes_iter(self._bytes))
+        return parsed
+
     __bytes__ = to_bytes
 
     def protocols(self) -> MultiAddrKeys:
@@ -201,23 +259,20 @@ class Multiaddr(collections.abc.Mapping[Any, Any]):
     def split(self, maxsplit: int = -1) -> list["Multiaddr"]:
         """Returns the list of individual path components this MultiAddr is made
         up of."""
-        final_split_offset = -1
-        results = []
-        for idx, (offset, proto, codec, part_value) in enumerate(bytes_iter(self._bytes)):
-            # Split at most `maxplit` times
-            if idx == maxsplit:
-                final_split_offset = offset
-                break
-
-            # Re-assemble binary MultiAddr representation
-            part_size = varint.encode(len(part_value)) if codec.SIZE < 0 else b""
-            part = b"".join((proto.vcode, part_size, part_value))
-
-            # Add MultiAddr with the given value
-            results.append(self.__class__(part))
+        components = self._components()
+        count = len(components)
+        # Split at most `maxsplit` times
+        if 0 <= maxsplit < count:
+            count = maxsplit
+
+        # Each component's encoding is already contiguous in self._bytes, so
+        # the parts are plain slices between consecutive offsets
+        offsets = [offset for offset, _, _, _ in components]
+        offsets.append(len(self._bytes))
+        results = [self.__class__(self._bytes[offsets[i] : offsets[i + 1]]) for i in range(count)]
         # Add final item with remainder of MultiAddr if there is anything left
-        if final_split_offset >= 0:
-            results.append(self.__class__(self._bytes[final_split_offset:]))
+        if count < len(components):
+            results.append(self.__class__(self._bytes[offsets[count] :]))
         return results
 
     keys = protocols
@@ -239,35 +294,50 @@ class Multiaddr(collections.abc.Mapping[Any, Any]):
     def decapsulate(self, addr: Union["Multiaddr", str]) -> "Multiaddr":
         """Remove a Multiaddr wrapping.
 
+        Everything from the last occurrence of ``addr`` onwards is removed.
+
         For example:
-            /ip4/1.2.3.4/tcp/80 decapsulate /ip4/1.2.3.4 = /tcp/80
+            /ip4/1.2.3.4/tcp/80 decapsulate /tcp/80 = /ip4/1.2.3.4
         """
-        addr_str = str(addr)
-        s = str(self)
-        i = s.rindex(addr_str)
-        if i < 0:
-            raise ValueError(f"Address {s} does not contain subaddress: {addr_str}")
-        return Multiaddr(s[:i])
+        if not isinstance(addr, Multiaddr):
+            try:
+                addr = Multiaddr(addr)
+            except exceptions.StringParseError:
+                # Not a complete multiaddr (e.g. "/tcp"), so fall back to
+                # matching on the string form like the JavaScript implementation
+                addr_str = str(addr)
+                s = str(self)
+                i = s.rfind(addr_str)
+                if i < 0:
+                    raise ValueError(f"Address {s} does not contain subaddress: {addr_str}")
+                return self.__class__(s[:i])
+
+        # Find the last occurrence of the other address that starts and ends on
+        # component boundaries, so a match can never begin or end mid-value
+        other = addr._bytes
+        if not other:
+            return self
+        components = self._components()
+        boundaries = {offset for offset, _, _, _ in components}
+        boundaries.add(len(self._bytes))
+        for offset, _, _, _ in reversed(components):
+            if offset + len(other) in boundaries and self._bytes.startswith(other, offset):
+                return self.__class__(self._bytes[:offset])
+        raise ValueError(f"Address {self} does not contain subaddress: {addr}")
 
     def decapsulate_code(self, code: int) -> "Multiaddr":
         """
         Remove the last occurrence of the protocol with the given code and everything after it.
         If the protocol code is not present, return the original multiaddr.
         """
-        # Find all protocol codes and their offsets
-        offsets = []
-        for offset, proto, codec, part_value in bytes_iter(self._bytes):
-            offsets.append((offset, proto.code))
-        # Find the last occurrence of the code
-        last_index = -1
-        for i, (offset, proto_code) in enumerate(offsets):
-            if proto_code == code:
-                last_index = i
-        if last_index == -1:
+        # Find the offset of the last occurrence of the code in a single pass
+        cut_offset = -1
+        for offset, proto, _, _ in self._components():
+            if proto.code == code:
+                cut_offset = offset
+        if cut_offset == -1:
             # Protocol code not found, return original
             return self
-        # Get the offset to slice up to
-        cut_offset = offsets[last_index][0]
         if cut_offset == 0:
             return self.__class__("")
         return self.__class__(self._bytes[:cut_offset])
@@ -288,11 +358,7 @@ class Multiaddr(collections.abc.Mapping[Any, Any]):
         ~multiaddr.exceptions.ProtocolLookupError
             MultiAddr does not contain any instance of this protocol
         """
-        proto = self.registry.find(proto)
-        for proto2, value in self.items():
-            if proto2 is proto or proto2 == proto:
-                return value
-        raise exceptions.ProtocolLookupError(proto, str(self))
+        return self[proto]
 
     def __getitem__(self, proto: Any) -> Any:
         """Returns the value for the given protocol.
@@ -305,8 +371,9 @@ class Multiaddr(collections.abc.Mapping[Any, Any]):
             If the protocol value is invalid.
         """
         proto = self.registry.find(proto)
-        for _, p, codec, part in bytes_iter(self._bytes):
-            if p == proto:
+        # Only the matching component is decoded
+        for _, p, codec, part in self._components():
+            if p is proto or p == proto:
                 if codec.SIZE == 0:
                     return None
                 try:
@@ -350,7 +417,8 @@ class Multiaddr(collections.abc.Mapping[Any, Any]):
         if not parts:
             raise exceptions.StringParseError("empty multiaddr", addr)
 
-        self._bytes = b""
+        # Encode every piece straight into a single buffer
+        out = bytearray()
         for part in parts:
             if not part:
                 continue
@@ -383,13 +451,12 @@ class Multiaddr(collections.abc.Mapping[Any, Any]):
                         raise exceptions.StringParseError(f"unknown codec: {proto.codec}", addr)
 
                     try:
-                        self._bytes += varint.encode(proto.code)
+                        _write_varint_into(out, proto.code)
                         buf = codec.to_bytes(proto, value)
                         # Add length prefix for variable-sized or zero-sized codecs
                         if codec.SIZE <= 0:
-                            self._bytes += varint.encode(len(buf))
-                        if buf:  # Only append buffer if it's not empty
-                            self._bytes += buf
+                            _write_varint_into(out, len(buf))
+                        out += buf
                     except Exception as e:
                         raise exceptions.StringParseError(str(e), addr) from e
                     continue
@@ -420,21 +487,17 @@ class Multiaddr(collections.abc.Mapping[Any, Any]):
                         )
                 # Validate value (optional: could add more checks here)
                 # If value looks like a protocol name, that's an error
-                try:
-                    protocol_with_name(value)
-                    # If no exception, value is a protocol name, which is not allowed here
+                if _protocol_with_name_or_none(value) is not None:
                     raise exceptions.StringParseError(
                         f"expected value for protocol {proto_name}, got protocol name {value}", addr
                     )
-                except exceptions.ProtocolNotFoundError:
-                    pass  # value is not a protocol name, so it's valid as a value
 
             codec = codec_by_name(proto.codec)
             if not codec:
                 raise exceptions.StringParseError(f"unknown codec: {proto.codec}", addr)
 
             try:
-                self._bytes += varint.encode(proto.code)
+                _write_varint_into(out, proto.code)
 
                 # Special case: protocols with codec=None are flag protocols
                 # (no value, no length prefix, no buffer)
@@ -443,12 +506,13 @@ class Multiaddr(collections.abc.Mapping[Any, Any]):
 
                 buf = codec.to_bytes(proto, value or "")
                 if codec.SIZE <= 0:  # Add length prefix for variable-sized or zero-sized codecs
-                    self._bytes += varint.encode(len(buf))
-                if buf:  # Only append buffer if it's not empty
-                    self._bytes += buf
+                    _write_varint_into(out, len(buf))
+                out += buf
             except Exception as e:
                 raise exceptions.StringParseError(str(e), addr) from e
 
+        self._bytes = bytes(out)
+
     def _from_bytes(self, addr: bytes) -> None:
         """Parse a binary multiaddr.
 
@@ -477,25 +541,21 @@ class Multiaddr(collections.abc.Mapping[Any, Any]):
             BinaryParseError: If the binary multiaddr is invalid.
         """
         try:
-            tuples = []
-
-            for _, proto, codec, part in bytes_iter(self._bytes):
-                if proto.name == "p2p":
-                    tuples.append((proto, part))
-
-                # If this is a p2p-circuit address, reset tuples to get target peer id
-                # not the peer id of the relay
-                if proto.name == "p2p-circuit":
-                    tuples = []
-
-            # Get the last p2p tuple (target peer ID for circuits)
-            if tuples:
-                last_tuple = tuples[-1]
-                proto, part = last_tuple
-                # Get the codec for this specific protocol
-                codec = codec_by_name(proto.codec)
+            peer = None
+            for _, proto, codec, part in self._components():
+                code = proto.code
+                if code == protocols.P_P2P:
+                    peer = (proto, codec, part)
+                # If this is a p2p-circuit address, forget the relay's peer id
+                # so the target peer id is returned instead
+                elif code == protocols.P_P2P_CIRCUIT:
+                    peer = None
+
+            # Only the last p2p component (the target for circuits) is decoded
+            if peer is not None:
+                proto, codec, part = peer
                 # Handle both fixed-size and variable-sized codecs
-                if codec is not None and codec.SIZE != 0:
+                if codec.SIZE != 0:
                     return codec.to_string(proto, part)
 
             return None
@@ -349,6 +349,11 @@ def protocol_with_name(name: str) -> Protocol:
     return REGISTRY.find_by_name(name)
 
 
+def _protocol_with_name_or_none(name: str) -> Optional[Protocol]:
+    """Find a protocol by its name, returning ``None`` instead of raising"""
+    return REGISTRY._names_to_protocols.get(name)
+
+
 def protocol_with_code(code: int) -> Protocol:
     """Find a protocol by its code
 
@@ -387,13 +392,21 @@ def protocols_with_string(string: str) -> list[Protocol]:
         string = "/" + string
     # consume trailing slashes
     string = string.rstrip("/")
+    if string.startswith("/unix/"):
+        # A leading unix component takes the rest of the string as its path, so
+        # there is no need to split it only to join it back together
+        proto = protocol_with_name("unix")
+        if codec_by_name(proto.codec).validate(proto, string[6:]) is None:
+            return [proto]
     sp = string.split("/")
+    end = len(sp)
 
     # skip the first element, since it starts with /
-    sp.pop(0)
+    i = 1
     protocols = []
-    while sp:
-        element = sp.pop(0)
+    while i < end:
+        element = sp[i]
+        i += 1
         if not element:  # Skip empty elements from multiple slashes
             continue
         try:
@@ -403,19 +416,18 @@ def protocols_with_string(string: str) -> list[Protocol]:
                 codec = codec_by_name(proto.codec)
                 if proto.name == "unix":
                     # For unix, consume all remaining elements as part of the path
-                    if sp:
-                        path_value = "/".join(sp)
-                        try:
-                            codec.to_bytes(proto, path_value)
-                            sp.clear()
+                    if i < end:
+                        path_value = "/".join(sp[i:])
+                        exc = codec.validate(proto, path_value)
+                        if exc is None:
+                            i = end
                             continue
-                        except Exception as exc:
-                            raise exceptions.StringParseError(
-                                f"Invalid path value for protocol {proto.name}",
-                                string,
-                                proto.name,
-                                exc,
-                            ) from exc
+                        raise exceptions.StringParseError(
+                            f"Invalid path value for protocol {proto.name}",
+                            string,
+                            proto.name,
+                            exc,
+                        ) from exc
                     else:
                         raise exceptions.StringParseError(
                             f"Protocol {proto.name} requires a path value",
@@ -423,49 +435,39 @@ def protocols_with_string(string: str) -> list[Protocol]:
                             proto.name,
                             ValueError("Missing required path value"),
                         )
-                elif sp:
+                elif i < end:
                     # Find next non-empty element
-                    next_elem = None
-                    while sp and not next_elem:
-                        next_elem = sp[0]
-                        if not next_elem:  # Skip empty elements
-                            sp.pop(0)
-                            continue
+                    while i < end and not sp[i]:
+                        i += 1
+                    next_elem = sp[i] if i < end else None
 
                     if next_elem:  # Only proceed if we found a non-empty element
                         # First try to validate as value for current protocol
-                        try:
-                            codec.to_bytes(proto, next_elem)
-                            sp.pop(0)
+                        exc = codec.validate(proto, next_elem)
+                        if exc is None:
+                            i += 1
                             continue
-                        except Exception as exc:
-                            # If value validation fails, check if it's a protocol name
-                            if next_elem.isalnum():
-                                try:
-                                    protocol_with_name(next_elem)
-                                    if proto.name in ["ip6zone"]:
-                                        if not any(codec.to_bytes(proto, val) for val in sp if val):
-                                            raise exceptions.StringParseError(
-                                                f"Protocol {proto.name} requires a value",
-                                                string,
-                                                proto.name,
-                                                ValueError("Missing required value"),
-                                            )
-                                    continue
-                                except exceptions.ProtocolNotFoundError:
-                                    raise exceptions.StringParseError(
-                                        f"Invalid value for protocol {proto.name}",
-                                        string,
-                                        proto.name,
-                                        exc,
-                                    ) from exc
-                            else:
+                        # If value validation fails, check if it's a protocol name;
+                        # only alphanumeric names may stand in a value slot
+                        if (
+                            not next_elem.isalnum()
+                            or _protocol_with_name_or_none(next_elem) is None
+                        ):
+                            raise exceptions.StringParseError(
+                                f"Invalid value for protocol {proto.name}",
+                                string,
+                                proto.name,
+                                exc,
+                            ) from exc
+                        if proto.name in ["ip6zone"]:
+                            if not any(codec.to_bytes(proto, val) for val in sp[i:] if val):
                                 raise exceptions.StringParseError(
-                                    f"Invalid value for protocol {proto.name}",
+                                    f"Protocol {proto.name} requires a value",
                                     string,
                                     proto.name,
-                                    exc,
-                                ) from exc
+                                    ValueError("Missing required value"),
+                                )
+                        continue
                     else:
                         if proto.name in ["ip6zone"]:
                             raise exceptions.StringParseError(
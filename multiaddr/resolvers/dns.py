@@ -19,9 +19,14 @@ Example usage:
     # [Multiaddr("/ip4/93.184.216.34/tcp/443")]
 """
 
+import copy
 import logging
+import math
 import re
-from typing import Optional, cast
+import socket
+import time
+from collections import OrderedDict
+from typing import Any, ContextManager, Optional, Union, cast
 
 import dns.asyncresolver
 import dns.rdataclass
@@ -34,8 +39,21 @@ import trio
 from ..exceptions import RecursionLimitError, ResolutionError
 from ..multiaddr import Multiaddr
 from ..protocols import P_DNS, P_DNS4, P_DNS6, P_DNSADDR, Protocol
+from ..transforms import bytes_iter
 from .base import Resolver
 
+_DNS_NAMES = frozenset({"dnsaddr", "dns4", "dns6"})
+_DNS_CODES = frozenset({P_DNS, P_DNS4, P_DNS6, P_DNSADDR})
+_DNS_ADDRESS_CODES = frozenset({P_DNS, P_DNS4, P_DNS6})
+_QUOTES_RE = re.compile(r'[\'"\s]+')
+
+
+def _first_protocol(maddr: "Multiaddr") -> Optional[Protocol]:
+    """Return the first protocol of a multiaddr without decoding the rest of it."""
+    for _, proto, _, _ in bytes_iter(maddr.to_bytes()):
+        return proto
+    return None
+
 
 class DNSResolver(Resolver):
     """
@@ -44,14 +62,47 @@ class DNSResolver(Resolver):
     Resolves /dns, /dns4, /dns6, and /dnsaddr multiaddrs to their underlying IP addresses.
     Supports recursive resolution for DNSADDR records and protocol-specific resolution for
     DNS4/DNS6.
+
+    Answers are cached per instance, so keep one resolver to reuse them across calls.
+    :meth:`Multiaddr.resolve` creates a new resolver each time and does not cache.
     """
 
     MAX_RECURSIVE_DEPTH = 32
     DEFAULT_TIMEOUT = 5.0  # 5 seconds timeout
+    CACHE_SIZE = 1000  # answers kept in the lookup cache
+    CACHE_TTL = 300.0  # longest time an answer is reused; shorter record TTLs win
+    NEGATIVE_CACHE_TTL = 60.0  # seconds a missing record is remembered
+    STALE_TTL = 86400.0  # seconds an expired answer may stand in, with serve_stale
+    STALE_REFRESH_TIMEOUT = 1.8  # seconds before a stale answer is used (RFC 8767 timer)
+    DNSADDR_CONCURRENCY = 8  # nested entries of one TXT record resolved at a time
+
+    def __init__(self, serve_stale: bool = False):
+        """Initialize the DNS resolver.
 
-    def __init__(self):
-        """Initialize the DNS resolver."""
+        Args:
+            serve_stale: Answer with an expired cached record, up to STALE_TTL
+                seconds old, when refreshing it fails (RFC 8767). Off by default.
+        """
         self._resolver = dns.asyncresolver.Resolver()
+        self._stale_ttl = self.STALE_TTL if serve_stale else 0.0
+        self._cache: OrderedDict[tuple[str, str], tuple[float, float, Any]] = OrderedDict()
+        # Lookups in progress are shared only within one trio run, since a
+        # resolver may be kept across runs; RunVar storage is dropped with the run.
+        self._inflight_var = trio.lowlevel.RunVar("dns_inflight")
+
+    @property
+    def _inflight(self) -> dict[tuple[str, str], tuple[trio.Event, list[Any]]]:
+        """The lookups in progress in the current trio run."""
+        try:
+            return self._inflight_var.get()
+        except LookupError:
+            inflight: dict[tuple[str, str], tuple[trio.Event, list[Any]]] = {}
+            self._inflight_var.set(inflight)
+            return inflight
+
+    def clear_cache(self) -> None:
+        """Forget all cached DNS answers."""
+        self._cache.clear()
 
     async def resolve(
         self, maddr: "Multiaddr", options: Optional[dict] = None
@@ -71,12 +122,11 @@ class DNSResolver(Resolver):
             RecursionLimitError: If maximum recursive depth is reached
             trio.Cancelled: If the operation is cancelled
         """
-        protocols: list[Protocol] = list(maddr.protocols())
-        if not protocols:
+        first_protocol = _first_protocol(maddr)
+        if first_protocol is None:
             raise ResolutionError("empty multiaddr")
 
-        first_protocol = protocols[0]
-        if first_protocol.code not in (P_DNS, P_DNS4, P_DNS6, P_DNSADDR):
+        if first_protocol.code not in _DNS_CODES:
             return [maddr]
 
         # Get the hostname and clean it of quotes
@@ -98,22 +148,25 @@ class DNSResolver(Resolver):
         signal = options.get("signal") if options else None
 
         try:
-            if first_protocol.code == P_DNSADDR:
-                resolved = await self._resolve_dnsaddr(
-                    hostname,
-                    maddr,
-                    max_depth,
-                    signal,
-                )
-                return resolved  # Do not fallback to [maddr]
-            else:
-                resolved = await self._resolve_dns_with_stack(maddr, signal)
-                return resolved if resolved else [maddr]  # Classic DNS fallback remains
+            # A single scope covers the whole lookup: the signal or the default timeout
+            with self._cancel_scope(signal):
+                if first_protocol.code == P_DNSADDR:
+                    resolved = await self._resolve_dnsaddr(hostname, maddr, max_depth)
+                    return resolved  # Do not fallback to [maddr]
+                else:
+                    resolved = await self._resolve_dns_with_stack(maddr)
+                    return resolved if resolved else [maddr]  # Classic DNS fallback remains
         except RecursionLimitError:
             # Do not wrap RecursionLimitError so tests can catch it
             raise
+        except trio.TooSlowError:
+            raise ResolutionError(
+                f"Failed to resolve {hostname}: timed out after {self.DEFAULT_TIMEOUT} seconds"
+            )
         except Exception as e:
             raise ResolutionError(f"Failed to resolve {hostname}: {e!s}")
+        # Only reached when the signal cancelled the lookup
+        return []
 
     def _clean_quotes(self, text: str) -> str:
         """Remove quotes from a string.
@@ -125,14 +178,152 @@ class DNSResolver(Resolver):
             The cleaned text without quotes
         """
         # Remove all types of quotes (single, double, mixed)
-        return re.sub(r'[\'"\s]+', "", text)
+        return _QUOTES_RE.sub("", text)
+
+    def _cancel_scope(self, signal: Optional[trio.CancelScope]) -> ContextManager[trio.CancelScope]:
+        """Return the scope a lookup runs in.
+
+        Args:
+            signal: Optional signal for cancellation
+
+        Returns:
+            The given signal, or a scope that fails after DEFAULT_TIMEOUT
+        """
+        if signal:
+            return signal
+        return trio.fail_after(self.DEFAULT_TIMEOUT)
+
+    async def _query(self, hostname: str, record_type: str) -> Any:
+        """Query a DNS record, reusing answers seen within the cache TTLs.
+
+        Concurrent queries for the same record share a single lookup. With
+        serve_stale, if the lookup fails for any reason other than the record not
+        existing, an expired answer still within STALE_TTL is served instead
+        (RFC 8767); the same happens if the refresh takes longer than
+        STALE_REFRESH_TIMEOUT.
+
+        Args:
+            hostname: The hostname to query
+            record_type: The DNS record type (A, AAAA or TXT)
+
+        Returns:
+            The DNS answer
+
+        Raises:
+            dns.resolver.NoAnswer: If the record does not exist (may be cached)
+            dns.resolver.NXDOMAIN: If the name does not exist (may be cached)
+        """
+        key = (hostname.lower(), record_type)
+        cache = self._cache
+        entry = cache.get(key)
+        if entry is not None and time.monotonic() < entry[0]:
+            cache.move_to_end(key)
+            result = entry[2]
+            if isinstance(result, type):
+                # Negative results are cached by class; raise a fresh instance
+                raise result()
+            return result
+
+        inflight_lookups = self._inflight
+        inflight = inflight_lookups.get(key)
+        if inflight is not None:
+            done, shared = inflight
+            await done.wait()
+            if not shared:
+                # The task doing the lookup was cancelled; try again ourselves
+                return await self._query(hostname, record_type)
+            result = shared[0]
+            # Each waiter raises its own exception rather than the owner's
+            if isinstance(result, type):
+                raise result()
+            if isinstance(result, Exception):
+                raise copy.copy(result)
+            return result
+
+        done = trio.Event()
+        outcome: list[Any] = []
+        inflight_lookups[key] = (done, outcome)
+        try:
+            answer = await self._fetch(key, hostname, record_type, entry)
+        except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN) as e:
+            outcome.append(type(e))
+            raise
+        except Exception as e:
+            outcome.append(e)
+            raise
+        else:
+            outcome.append(answer)
+            return answer
+        finally:
+            del inflight_lookups[key]
+            done.set()
+
+    async def _fetch(
+        self,
+        key: tuple[str, str],
+        hostname: str,
+        record_type: str,
+        entry: Optional[tuple[float, float, Any]],
+    ) -> Any:
+        """Look a record up on the network and cache the outcome.
+
+        Args:
+            key: The cache key of the record
+            hostname: The hostname to query
+            record_type: The DNS record type (A, AAAA or TXT)
+            entry: The expired cache entry for the record, if any
+
+        Returns:
+            The DNS answer, or the stale cached answer if the lookup failed or hung
+        """
+        stale = None
+        if entry is not None and time.monotonic() < entry[1] and not isinstance(entry[2], type):
+            stale = entry[2]
+        # With a stale answer to fall back on, give up on the server well before
+        # the caller's own timeout would cancel the whole resolution.
+        timeout = self.STALE_REFRESH_TIMEOUT if stale is not None else math.inf
+        try:
+            with trio.move_on_after(timeout) as scope:
+                answer = await self._resolver.resolve(hostname, record_type)
+        except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN) as e:
+            self._store(key, self.NEGATIVE_CACHE_TTL, 0.0, type(e))
+            raise
+        except Exception as e:
+            if stale is not None:
+                logging.debug(f"Serving stale {record_type} answer for {hostname}: {e}")
+                return stale
+            raise
+        if scope.cancelled_caught:
+            logging.debug(f"Serving stale {record_type} answer for {hostname}: timed out")
+            return stale
+        self._store(key, self._answer_ttl(answer), self._stale_ttl, answer)
+        return answer
+
+    def _answer_ttl(self, answer: Any) -> float:
+        """Return how long an answer may be reused: its record TTL, capped at CACHE_TTL."""
+        rrset = getattr(answer, "rrset", None)
+        ttl = getattr(rrset, "ttl", None)
+        if isinstance(ttl, int):
+            return min(float(ttl), self.CACHE_TTL)
+        return self.CACHE_TTL
+
+    def _store(self, key: tuple[str, str], ttl: float, stale_ttl: float, result: Any) -> None:
+        """Cache a DNS answer (or the class of a negative result) for ttl seconds.
+
+        The answer may be served for stale_ttl more seconds if a refresh fails.
+        """
+        cache = self._cache
+        fresh_until = time.monotonic() + ttl
+        cache[key] = (fresh_until, fresh_until + stale_ttl, result)
+        cache.move_to_end(key)
+        while len(cache) > self.CACHE_SIZE:
+            cache.popitem(last=False)
 
     async def _resolve_dnsaddr(
         self,
         hostname: str,
         original_ma: "Multiaddr",
         max_depth: int,
-        signal: Optional[trio.CancelScope] = None,
     ) -> list["Multiaddr"]:
         """
         Resolve a DNSADDR record according to libp2p specification.
@@ -144,7 +335,6 @@ class DNSResolver(Resolver):
             hostname: The hostname to resolve
             original_ma: The original multiaddr being resolved
             max_depth: Maximum depth for recursive resolution
-            signal: Optional signal for cancellation
 
         Returns:
             A list of resolved multiaddrs
@@ -169,22 +359,7 @@ class DNSResolver(Resolver):
         dnsaddr_hostname = f"_dnsaddr.{hostname}"
 
         try:
-            if signal:
-                # Use the provided signal for cancellation
-                with signal:
-                    return await self._query_dnsaddr_txt_records(
-                        dnsaddr_hostname, peer_id, max_depth, signal
-                    )
-            else:
-                # Use default timeout-based cancellation
-                with trio.CancelScope() as cancel_scope:  # type: ignore[call-arg]
-                    # Set a timeout for DNS resolution
-                    cancel_scope.deadline = trio.current_time() + self.DEFAULT_TIMEOUT
-                    cancel_scope.cancelled_caught = True
-
-                    return await self._query_dnsaddr_txt_records(
-                        dnsaddr_hostname, peer_id, max_depth, cancel_scope
-                    )
+            return await self._query_dnsaddr_txt_records(dnsaddr_hostname, peer_id, max_depth)
         except Exception as e:
             raise ResolutionError(f"Failed to resolve DNSADDR {hostname}: {e!s}")
 
@@ -193,7 +368,6 @@ class DNSResolver(Resolver):
         dnsaddr_hostname: str,
         peer_id: Optional[str],
         max_depth: int,
-        signal: Optional[trio.CancelScope] = None,
         _debug_level: int = 0,
     ) -> list["Multiaddr"]:
         """
@@ -203,20 +377,21 @@ class DNSResolver(Resolver):
             dnsaddr_hostname: The _dnsaddr.<hostname> to query
             peer_id: Optional peer ID to filter results
             max_depth: Maximum depth for recursive resolution
-            signal: Optional signal for cancellation
             _debug_level: Internal, for debug output indentation
 
         Returns:
             A list of resolved multiaddrs
         """
-        results = []
+        # One list per TXT entry, so concurrent recursion keeps the record order
+        results: list[list[Multiaddr]] = []
         indent = "  " * _debug_level
         try:
-            answer = await self._resolver.resolve(dnsaddr_hostname, "TXT")
+            answer = await self._query(dnsaddr_hostname, "TXT")
             logging.debug(
                 f"{indent}Queried TXT for {dnsaddr_hostname}, "
                 f"found {len(answer)} records (depth {max_depth})"
             )
+            pending = []
             for rdata in answer:
                 # Cast to TXT record type for proper attribute access
                 txt_rdata = cast(dns.rdtypes.ANY.TXT.TXT, rdata)
@@ -234,62 +409,90 @@ class DNSResolver(Resolver):
                         continue
                     try:
                         parsed_ma = Multiaddr(multiaddr_str)
-                        try:
-                            parsed_peer_id = parsed_ma.get_peer_id()
-                            logging.debug(f"{indent}      Peer ID: {parsed_peer_id}")
-                        except Exception:
-                            logging.debug(f"{indent}      No peer ID")
-                        if peer_id:
-                            try:
-                                parsed_peer_id = parsed_ma.get_peer_id()
-                                if parsed_peer_id != peer_id:
-                                    logging.debug(f"{indent}      Skipping (peer ID mismatch)")
-                                    continue
-                            except Exception:
-                                logging.debug(f"{indent}      Skipping (no peer ID in multiaddr)")
-                                continue
+                        # get_peer_id() never raises, it returns None on failure
+                        parsed_peer_id = parsed_ma.get_peer_id()
+                        logging.debug(f"{indent}      Peer ID: {parsed_peer_id}")
+                        if peer_id and parsed_peer_id != peer_id:
+                            logging.debug(f"{indent}      Skipping (peer ID mismatch)")
+                            continue
                         if (
                             multiaddr_str.startswith("/dnsaddr")
                             or multiaddr_str.startswith("/dns4")
                             or multiaddr_str.startswith("/dns6")
                         ):
-                            try:
-                                logging.debug(f"{indent}      Recursing into {multiaddr_str}")
-                                recursive_options = {"max_recursive_depth": max_depth - 1}
-                                resolved = await self.resolve(parsed_ma, recursive_options)
-                                for r in resolved:
-                                    # Only append if not a dnsaddr/dns4/dns6 (i.e., only final IPs)
-                                    if not any(
-                                        p.name in ("dnsaddr", "dns4", "dns6") for p in r.protocols()
-                                    ):
-                                        logging.debug(f"{indent}        Final resolved: {r}")
-                                        results.append(r)
-                            except RecursionLimitError:
-                                logging.debug(f"{indent}      Recursion limit hit!")
-                                continue
+                            entry_results: list[Multiaddr] = []
+                            results.append(entry_results)
+                            pending.append((parsed_ma, entry_results))
                         else:
                             logging.debug(f"{indent}      Final resolved: {parsed_ma}")
-                            results.append(parsed_ma)
+                            results.append([parsed_ma])
                     except Exception as e:
                         logging.debug(f"{indent}      Error parsing multiaddr: {e}")
                         continue
+            if pending:
+                # Resolve the nested entries concurrently rather than one after
+                # another, but bounded. Each record gets its own limiter, since the
+                # entries holding a slot recurse into records of their own.
+                limiter = trio.CapacityLimiter(self.DNSADDR_CONCURRENCY)
+                async with trio.open_nursery() as nursery:
+                    for parsed_ma, entry_results in pending:
+                        nursery.start_soon(
+                            self._resolve_dnsaddr_entry,
+                            parsed_ma,
+                            max_depth,
+                            entry_results,
+                            indent,
+                            limiter,
+                        )
         except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN):
             logging.debug(f"{indent}No TXT records found for {dnsaddr_hostname}")
             pass
         except Exception as e:
             logging.debug(f"{indent}Error querying TXT records for {dnsaddr_hostname}: {e}")
             raise ResolutionError(f"Failed to query TXT records for {dnsaddr_hostname}: {e!s}")
-        return results
+        # Several TXT entries often lead to the same address; keep the first of each
+        return list(dict.fromkeys(maddr for entry_results in results for maddr in entry_results))
 
-    async def _resolve_dns(
-        self, hostname: str, protocol_code: int, signal: Optional[trio.CancelScope] = None
-    ) -> list["Multiaddr"]:
+    async def _resolve_dnsaddr_entry(
+        self,
+        maddr: "Multiaddr",
+        max_depth: int,
+        results: list["Multiaddr"],
+        indent: str,
+        limiter: trio.CapacityLimiter,
+    ) -> None:
+        """Recursively resolve one dnsaddr entry, collecting only the final IP addresses.
+
+        Args:
+            maddr: The /dnsaddr, /dns4 or /dns6 entry to resolve
+            max_depth: Maximum depth for recursive resolution
+            results: The list the resolved multiaddrs are appended to
+            indent: Indentation for debug output
+            limiter: Bounds how many entries of the same record resolve at once
+        """
+        try:
+            async with limiter:
+                logging.debug(f"{indent}      Recursing into {maddr}")
+                recursive_options = {"max_recursive_depth": max_depth - 1}
+                resolved = await self.resolve(maddr, recursive_options)
+        except RecursionLimitError as e:
+            logging.debug(f"{indent}      Recursion limit hit for {maddr}: {e}")
+            return
+        except Exception as e:
+            logging.debug(f"{indent}      Error resolving {maddr}: {e}")
+            return
+        for r in resolved:
+            # Only append if not a dnsaddr/dns4/dns6 (i.e., only final IPs)
+            if not any(p.name in _DNS_NAMES for p in r.protocols()):
+                logging.debug(f"{indent}        Final resolved: {r}")
+                results.append(r)
+
+    async def _resolve_dns(self, hostname: str, protocol_code: int) -> list["Multiaddr"]:
         """Resolve a DNS record.
 
         Args:
             hostname: The hostname to resolve
             protocol_code: The protocol code (DNS, DNS4, or DNS6)
-            signal: Optional signal for cancellation
 
         Returns:
             A list of resolved multiaddrs
@@ -299,53 +502,64 @@ class DNSResolver(Resolver):
             trio.Cancelled: If the operation is cancelled
         """
         try:
-            if signal:
-                # Use the provided signal for cancellation
-                with signal:
-                    results = []
-                    if protocol_code in (P_DNS, P_DNS4):
-                        try:
-                            answer = await self._resolver.resolve(hostname, "A")
-                            for rdata in answer:
-                                address = str(cast(dns.rdtypes.IN.A.A, rdata).address)
-                                results.append(Multiaddr(f"/ip4/{address}"))
-                        except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN):
-                            pass
-                    if protocol_code in (P_DNS, P_DNS6):
-                        try:
-                            answer = await self._resolver.resolve(hostname, "AAAA")
-                            for rdata in answer:
-                                address = str(cast(dns.rdtypes.IN.AAAA.AAAA, rdata).address)
-                                results.append(Multiaddr(f"/ip6/{address}"))
-                        except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN):
-                            pass
-                    return results
-            else:
-                # No signal provided, proceed without cancellation
-                results = []
-                if protocol_code in (P_DNS, P_DNS4):
-                    try:
-                        answer = await self._resolver.resolve(hostname, "A")
-                        for rdata in answer:
-                            address = str(cast(dns.rdtypes.IN.A.A, rdata).address)
-                            results.append(Multiaddr(f"/ip4/{address}"))
-                    except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN):
-                        pass
-                if protocol_code in (P_DNS, P_DNS6):
-                    try:
-                        answer = await self._resolver.resolve(hostname, "AAAA")
-                        for rdata in answer:
-                            address = str(cast(dns.rdtypes.IN.AAAA.AAAA, rdata).address)
-                            results.append(Multiaddr(f"/ip6/{address}"))
-                    except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN):
-                        pass
-                return results
+            return await self._lookup_addresses(hostname, protocol_code)
         except Exception as e:
             raise ResolutionError(f"Failed to resolve DNS {hostname}: {e!s}")
 
-    async def _resolve_dns_with_stack(
-        self, maddr: "Multiaddr", signal: Optional[trio.CancelScope] = None
+    async def _lookup_addresses(self, hostname: str, protocol_code: int) -> list["Multiaddr"]:
+        """Look up the A and/or AAAA records a DNS protocol asks for.
+
+        For /dns both queries are issued concurrently; IPv4 results still come
+        before IPv6 results.
+
+        Args:
+            hostname: The hostname to resolve
+            protocol_code: The protocol code (DNS, DNS4, or DNS6)
+
+        Returns:
+            A list of /ip4 and /ip6 multiaddrs
+        """
+        queries = []
+        if protocol_code in (P_DNS, P_DNS4):
+            queries.append(("A", socket.AF_INET))
+        if protocol_code in (P_DNS, P_DNS6):
+            queries.append(("AAAA", socket.AF_INET6))
+        if len(queries) == 1:
+            return await self._query_addresses(hostname, *queries[0])
+
+        answers: list[list[Multiaddr]] = [[] for _ in queries]
+        errors: list[Exception] = []
+
+        async def run_query(index: int, record_type: str, family: int) -> None:
+            # Keep failures out of the nursery so they are not wrapped in an
+            # exception group; /dns then reports the same errors as /dns4 and /dns6
+            try:
+                answers[index] = await self._query_addresses(hostname, record_type, family)
+            except Exception as e:
+                errors.append(e)
+
+        async with trio.open_nursery() as nursery:
+            for index, (record_type, family) in enumerate(queries):
+                nursery.start_soon(run_query, index, record_type, family)
+        if errors:
+            raise errors[0]
+        return [maddr for answer in answers for maddr in answer]
+
+    async def _query_addresses(
+        self, hostname: str, record_type: str, family: int
     ) -> list["Multiaddr"]:
+        """Query one address record type and convert the answers to multiaddrs."""
+        try:
+            answer = await self._query(hostname, record_type)
+        except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN):
+            return []
+        results = []
+        for rdata in answer:
+            address = str(cast(Union[dns.rdtypes.IN.A.A, dns.rdtypes.IN.AAAA.AAAA], rdata).address)
+            results.append(Multiaddr.from_ip_tuple(family, address))
+        return results
+
+    async def _resolve_dns_with_stack(self, maddr: "Multiaddr") -> list["Multiaddr"]:
         """Resolve a DNS record while preserving the rest of the multiaddr stack.
 
         This method handles cases like /dns4/host/tcp/port by resolving the DNS part
@@ -353,7 +567,6 @@ class DNSResolver(Resolver):
 
         Args:
             maddr: The multiaddr to resolve
-            signal: Optional signal for cancellation
 
         Returns:
             A list of resolved multiaddrs with preserved stack
@@ -362,12 +575,11 @@ class DNSResolver(Resolver):
             ResolutionError: If resolution fails
             trio.Cancelled: If the operation is cancelled
         """
-        protocols = list(maddr.protocols())
-        if not protocols:
+        first_protocol = _first_protocol(maddr)
+        if first_protocol is None:
             return [maddr]
 
-        first_protocol = protocols[0]
-        if first_protocol.code not in (P_DNS, P_DNS4, P_DNS6):
+        if first_protocol.code not in _DNS_ADDRESS_CODES:
             return [maddr]
 
         # Get the hostname
@@ -379,7 +591,7 @@ class DNSResolver(Resolver):
         hostname = self._clean_quotes(hostname)
 
         # Get the resolved IP addresses
-        resolved_ips = await self._resolve_dns(hostname, first_protocol.code, signal)
+        resolved_ips = await self._resolve_dns(hostname, first_protocol.code)
         if not resolved_ips:
             return [maddr]
 
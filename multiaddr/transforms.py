@@ -1,65 +1,98 @@
+import functools
 import io
-import logging
 from collections.abc import Generator
-from io import BytesIO
+from typing import Optional
 
 import varint
 
-from . import exceptions
+from . import exceptions, protocols
 from .codecs import CodecBase, codec_by_name
-from .protocols import Protocol, protocol_with_code, protocol_with_name
+from .protocols import Protocol, ProtocolRegistry, protocol_with_code, protocol_with_name
 
-logger = logging.getLogger(__name__)
+# Bound on the number of distinct addresses remembered by each whole-parse cache
+PARSE_CACHE_SIZE = 4096
+
+# codec name -> (codec, fixed byte size or -1 if length-prefixed, IS_PATH), filled on first use
+_CODEC_LAYOUT: dict[Optional[str], tuple[CodecBase, int, bool]] = {}
+
+
+def _codec_layout(name: Optional[str]) -> tuple[CodecBase, int, bool]:
+    """Look up a codec together with the size and path flags the parsers need"""
+    layout = _CODEC_LAYOUT.get(name)
+    if layout is None:
+        codec = codec_by_name(name)
+        size = codec.SIZE // 8 if codec.SIZE >= 0 else -1
+        layout = _CODEC_LAYOUT[name] = (codec, size, codec.IS_PATH)
+    return layout
+
+
+def _write_varint(n: int) -> bytes:
+    """Encode a protocol code or length prefix, special-casing the one- and two-byte forms"""
+    if n < 0x80:
+        return bytes((n,))
+    if n < 0x4000:
+        return bytes((n & 0x7F | 0x80, n >> 7))
+    return varint.encode(n)
+
+
+def _write_varint_into(out: bytearray, n: int) -> None:
+    """Append the varint encoding of ``n`` to ``out`` without building a bytes object"""
+    while n > 0x7F:
+        out.append(n & 0x7F | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _read_varint(buf: bytes, offset: int) -> tuple[int, int]:
+    """Decode the varint starting at ``buf[offset]``
+
+    Returns the decoded value and the offset just past it. Decoding straight
+    from the buffer avoids wrapping it in a stream and reading byte by byte.
+    """
+    result = 0
+    shift = 0
+    end = len(buf)
+    while offset < end:
+        byte = buf[offset]
+        offset += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, offset
+        shift += 7
+    raise EOFError("Unexpected EOF while reading varint")
 
 
 def string_to_bytes(string: str) -> bytes:
-    bs: list[bytes] = []
+    # The active registry is part of the cache key, so swapping it never
+    # serves an encoding produced under a different set of protocols
+    return _string_to_bytes(string, protocols.REGISTRY)
+
+
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _string_to_bytes(string: str, registry: ProtocolRegistry) -> bytes:
+    out = bytearray()
+    layout_get = _CODEC_LAYOUT.get
     for proto, codec, value in string_iter(string):
-        logger.debug(
-            f"[DEBUG string_to_bytes] LOOP: proto={proto.name}, codec={codec}, value={value}"
-        )
-        logger.debug(
-            f"[DEBUG string_to_bytes] Processing: proto={proto.name}, "
-            f"codec.SIZE={getattr(codec, 'SIZE', None) if codec else None}, value={value}"
-        )
-        logger.debug(f"[DEBUG string_to_bytes] Protocol code: {proto.code}")
-        encoded_code = varint.encode(proto.code)
-        logger.debug(f"[DEBUG string_to_bytes] Encoded protocol code: {encoded_code}")
-        bs.append(encoded_code)
+        _write_varint_into(out, proto.code)
 
         # Special case: protocols with codec=None are flag protocols
         # (no value, no length prefix, no buffer)
-        if codec is None:
-            logger.debug(
-                f"[DEBUG string_to_bytes] Protocol {proto.name} has no data, "
-                "skipping value encoding"
-            )
+        codec_name = proto.codec
+        if codec_name is None:
             continue
 
         if value is None:
             raise ValueError("Value cannot be None")
         try:
-            logger.debug(f"[DEBUG string_to_bytes] Raw CID value before encoding: {value}")
             buf = codec.to_bytes(proto, value)
-            logger.debug(f"[DEBUG string_to_bytes] Generated buf: proto={proto.name}, buf={buf}")
         except Exception as exc:
-            logger.debug(f"[DEBUG string_to_bytes] Error: {exc}")
             raise exceptions.StringParseError(str(exc), string) from exc
-        logger.debug(
-            f"[DEBUG string_to_bytes] Appending: proto={proto.name}, "
-            f"codec.SIZE={getattr(codec, 'SIZE', None)}"
-        )
         # Only add length prefix for variable-sized codecs (SIZE <= 0)
-        if codec.SIZE <= 0:
-            bs.append(varint.encode(len(buf)))
-            logger.debug(
-                f"[DEBUG string_to_bytes] Appending varint length: {varint.encode(len(buf))}"
-            )
-        # Only append the buffer if it's not empty
-        if buf:
-            bs.append(buf)
-        logger.debug(f"[DEBUG string_to_bytes] Final bs: {bs}")
-    return b"".join(bs)
+        layout = layout_get(codec_name) or _codec_layout(codec_name)
+        if layout[1] <= 0:
+            _write_varint_into(out, len(buf))
+        out += buf
+    return bytes(out)
 
 
 def bytes_to_string(buf: bytes) -> str:
@@ -70,34 +103,54 @@ def bytes_to_string(buf: bytes) -> str:
     ~multiaddr.exceptions.BinaryParseError
         The given bytes are not a valid multiaddr.
     """
+    if type(buf) is not bytes:
+        # Mutable buffers cannot be cache keys
+        return _bytes_to_string.__wrapped__(buf, protocols.REGISTRY)
+    return _bytes_to_string(buf, protocols.REGISTRY)
+
+
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _bytes_to_string(buf: bytes, registry: ProtocolRegistry) -> str:
     if not buf:
         return ""
-    bs = BytesIO(buf)
-    strings = []
+    offset = 0
+    end = len(buf)
+    strings: list[str] = []
     code = None
     proto = None
-    while bs.tell() < len(buf):
+    # Bind the per-component lookups once rather than resolving them every iteration
+    find_protocol = registry.find_by_code
+    layout_get = _CODEC_LAYOUT.get
+    extend = strings.extend
+    while offset < end:
         try:
-            code = varint.decode_stream(bs)
-            logger.debug(f"[DEBUG bytes_to_string] Decoded protocol code: {code}")
-            proto = protocol_with_code(code)
-            logger.debug(f"[DEBUG bytes_to_string] Protocol name: {proto.name}")
-            if proto.codec is not None:
-                codec = codec_by_name(proto.codec)
-                if codec.SIZE > 0:
-                    value = codec.to_string(proto, bs.read(codec.SIZE // 8))
-                else:
+            # Nearly all protocol codes and lengths fit in a single varint byte
+            code = buf[offset]
+            if code < 0x80:
+                offset += 1
+            else:
+                code, offset = _read_varint(buf, offset)
+            proto = find_protocol(code)
+            codec_name = proto.codec
+            if codec_name is not None:
+                codec, size, is_path = layout_get(codec_name) or _codec_layout(codec_name)
+                if size <= 0:
                     # For variable-sized codecs,
                     # read the length prefix but don't pass it to the codec
-                    size = varint.decode_stream(bs)
-                    value = codec.to_string(proto, bs.read(size))
-                logger.debug(f"[DEBUG] bytes_to_string: proto={proto.name}, value='{value}'")
-                if codec.IS_PATH and value.startswith("/"):
-                    strings.append(f"/{proto.name}{value}")
+                    if offset < end and buf[offset] < 0x80:
+                        size = buf[offset]
+                        offset += 1
+                    else:
+                        size, offset = _read_varint(buf, offset)
+                value = codec.to_string(proto, buf[offset : offset + size])
+                offset += size
+                # Collect the segments and let the final join build the string once
+                if is_path and value.startswith("/"):
+                    extend(("/", proto.name, value))
                 else:
-                    strings.append(f"/{proto.name}/{value}")
+                    extend(("/", proto.name, "/", value))
             else:
-                strings.append(f"/{proto.name}")
+                extend(("/", proto.name))
         except Exception as exc:
             # Use the code as the protocol identifier if proto is not available
             # Ensure we always have either a string or an integer
@@ -128,41 +181,49 @@ def string_iter(
         return
 
     parts = string.strip("/").split("/")
+    end = len(parts)
     i = 0
-    while i < len(parts):
+    while i < end:
         proto_name = parts[i]
         try:
             proto = protocol_with_name(proto_name)
         except exceptions.ProtocolNotFoundError as exc:
             raise exceptions.StringParseError(str(exc), string) from exc
 
-        codec = codec_by_name(proto.codec)
+        codec_name = proto.codec
+        codec = codec_by_name(codec_name)
         value = None
 
-        if proto.codec is not None:
-            if i + 1 >= len(parts):
+        if codec_name is not None:
+            if i + 1 >= end:
                 raise exceptions.StringParseError(
                     f"missing value for protocol: {proto_name}", string
                 )
             value = parts[i + 1]
             i += 1  # Skip the next part since we used it as value
-            logger.debug(f"[DEBUG string_iter] Using next part as value: {value}")
             yield proto, codec, value
         else:
-            logger.debug(f"[DEBUG string_iter] No value found for protocol {proto.name}")
             yield proto, codec, None
         i += 1
 
 
 def bytes_iter(buf: bytes) -> Generator[tuple[int, Protocol, CodecBase, bytes], None, None]:
-    buf_io = io.BytesIO(buf)
-    while buf_io.tell() < len(buf):
-        offset = buf_io.tell()
-        code = varint.decode_stream(buf_io)
+    offset = 0
+    end = len(buf)
+    layout_get = _CODEC_LAYOUT.get
+    while offset < end:
+        start = offset
+        # Nearly all protocol codes and lengths fit in a single varint byte
+        code = buf[offset]
+        if code < 0x80:
+            offset += 1
+        else:
+            code, offset = _read_varint(buf, offset)
         proto = None
         try:
             proto = protocol_with_code(code)
-            codec = codec_by_name(proto.codec)
+            codec_name = proto.codec
+            codec, size, _ = layout_get(codec_name) or _codec_layout(codec_name)
         except (ImportError, exceptions.ProtocolNotFoundError) as exc:
             raise exceptions.BinaryParseError(
                 "Unknown Protocol",
@@ -170,5 +231,11 @@ def bytes_iter(buf: bytes) -> Generator[tuple[int, Protocol, CodecBase, bytes],
                 proto.name if proto else code,
             ) from exc
 
-        size = size_for_addr(codec, buf_io)
-        yield offset, proto, codec, buf_io.read(size)
+        if size < 0:
+            if offset < end and buf[offset] < 0x80:
+                size = buf[offset]
+                offset += 1
+            else:
+                size, offset = _read_varint(buf, offset)
+        yield start, proto, codec, buf[offset : offset + size]
+        offset += size
@@ -1,28 +1,61 @@
 import socket
+import threading
+import time
 from typing import Any, Optional
 
 import psutil
 
 from .multiaddr import Multiaddr
 
+_IP_NAMES = frozenset({"ip4", "ip6"})
+_TRANSPORT_NAMES = frozenset({"tcp", "udp"})
+
+# Interface enumeration is a full netlink/adapter dump, so results are reused
+# for a short while instead of being re-queried on every call.
+_IF_CACHE_TTL = 30.0
+_IF_CACHE: dict[str, Any] = {"ts": 0.0, "addrs": None}
+_IF_CACHE_LOCK = threading.Lock()
+
 
 def is_wildcard(ip: str) -> bool:
     """Check if an IP address is a wildcard address."""
     return ip in ["0.0.0.0", "::"]
 
 
+def invalidate_interface_cache() -> None:
+    """Drop cached interface addresses so the next lookup re-queries the host."""
+    with _IF_CACHE_LOCK:
+        _IF_CACHE["addrs"] = None
+
+
 def get_network_addrs(family: int) -> list[str]:
-    """Get all network addresses for a given IP family (4 for IPv4, 6 for IPv6)."""
-    addresses = []
-    for iface, addrs in psutil.net_if_addrs().items():
+    """Get all network addresses for a given IP family (4 for IPv4, 6 for IPv6).
+
+    Results are cached for 30 seconds; call :func:`invalidate_interface_cache`
+    to force a refresh.
+    """
+    now = time.monotonic()
+    with _IF_CACHE_LOCK:
+        addrs = _IF_CACHE["addrs"]
+        if addrs is None or now - _IF_CACHE["ts"] >= _IF_CACHE_TTL:
+            addrs = _collect_all_ifaddrs()
+            _IF_CACHE["ts"] = now
+            _IF_CACHE["addrs"] = addrs
+    return list(addrs.get(family, ()))
+
+
+def _collect_all_ifaddrs() -> dict[int, list[str]]:
+    """Enumerate the host interfaces once and split the addresses by IP family."""
+    addresses: dict[int, list[str]] = {4: [], 6: []}
+    for addrs in psutil.net_if_addrs().values():
         for addr in addrs:
-            if family == 4 and addr.family == socket.AF_INET:
+            if addr.family == socket.AF_INET:
                 if addr.address != "127.0.0.1" and not is_link_local_ip(addr.address):
-                    addresses.append(addr.address)
-            elif family == 6 and addr.family == socket.AF_INET6:
+                    addresses[4].append(addr.address)
+            elif addr.family == socket.AF_INET6:
                 if not addr.address.startswith("::1") and not is_link_local_ip(addr.address):
                     # Remove the %scope_id if present
-                    addresses.append(addr.address.split("%")[0])
+                    addresses[6].append(addr.address.split("%")[0])
     return addresses
 
 
@@ -57,11 +90,11 @@ def get_multiaddr_options(ma: Multiaddr) -> Optional[dict[str, Any]]:
     port = None
 
     for i, part in enumerate(parts):
-        if part in ["ip4", "ip6"]:
+        if part in _IP_NAMES:
             if i + 1 < len(parts):
                 ip_proto = part
                 ip_addr = parts[i + 1]
-        elif part in ["tcp", "udp"]:
+        elif part in _TRANSPORT_NAMES:
             if i + 1 < len(parts):
                 transport_proto = part
                 try:
@@ -107,11 +140,11 @@ def get_thin_waist_addresses(
     if is_wildcard(options["host"]):
         # Expand wildcard addresses to all available interfaces
         addrs = []
+        # get_network_addrs already excludes loopback and link-local addresses
         for host in get_network_addrs(options["family"]):
-            if not is_link_local_ip(host):
-                # Correct multiaddr format: /ip4/host/tcp/port or /ip6/host/tcp/port
-                addr_str = f"/{ip_proto}/{host}/{options['transport']}/{target_port}"
-                addrs.append(Multiaddr(addr_str))
+            # Correct multiaddr format: /ip4/host/tcp/port or /ip6/host/tcp/port
+            addr_str = f"/{ip_proto}/{host}/{options['transport']}/{target_port}"
+            addrs.append(Multiaddr(addr_str))
         return addrs
     else:
         # Return the specific address
@@ -1,3 +1,6 @@
+import operator
+import socket
+
 import pytest
 
 from multiaddr.exceptions import (
@@ -601,6 +604,7 @@ def test_decapsulate_code():
     assert str(ma.decapsulate_code(P_IP4)) == ""
     # Not present: returns original
     assert str(ma.decapsulate_code(9999)) == str(ma)
+    assert ma.decapsulate_code(9999) is ma
 
     # Multiple occurrences
     ma2 = Multiaddr("/dns4/example.com/tcp/1234/dns4/foo.com/tcp/5678")
@@ -611,3 +615,44 @@ def test_decapsulate_code():
     # No-op on empty
     ma3 = Multiaddr("")
     assert str(ma3.decapsulate_code(P_TCP)) == ""
+
+
+def test_views_share_parsed_components():
+    ma = Multiaddr("/ip4/1.2.3.4/tcp/80/p2p/QmcgpsyWgH8Y8ajJz1Cu72KnS5uo2Aa2LpzU7kinSupNKC")
+    components = ma._components()
+    assert ma._components() is components
+    assert ma.protocols()[-1].name == "p2p"
+    assert ma.items()[1] == (protocol_with_name("tcp"), "80")
+    assert [proto for _, proto, _, _ in components] == list(ma.keys())
+    assert operator.length_hint(ma.values()) == len(components)
+
+
+def test_decapsulate_matches_whole_components():
+    a = Multiaddr("/ip4/1.2.3.45/tcp/80/tcp/80")
+    assert a.decapsulate("/tcp/80") == Multiaddr("/ip4/1.2.3.45/tcp/80")
+    assert a.decapsulate("/tcp") == Multiaddr("/ip4/1.2.3.45/tcp/80")
+    assert a.decapsulate(a) == Multiaddr("")
+    with pytest.raises(ValueError):
+        a.decapsulate("/ip4/1.2.3.4")
+    with pytest.raises(ValueError):
+        a.decapsulate("/tcp/8")
+
+
+@pytest.mark.parametrize(
+    "family, ip, expected",
+    [
+        (socket.AF_INET, "127.0.0.1", "/ip4/127.0.0.1"),
+        (socket.AF_INET6, "2001:db8::1", "/ip6/2001:db8::1"),
+    ],
+)
+def test_from_ip_tuple(family, ip, expected):
+    assert Multiaddr.from_ip_tuple(family, ip) == Multiaddr(expected)
+
+
+@pytest.mark.parametrize(
+    "family, ip",
+    [(socket.AF_INET, "::1"), (socket.AF_INET6, "1.2.3"), (-1, "1.2.3.4")],
+)
+def test_from_ip_tuple_invalid(family, ip):
+    with pytest.raises(ValueError):
+        Multiaddr.from_ip_tuple(family, ip)
@@ -105,7 +105,8 @@ def test_protocol_equality():
 
 @pytest.mark.parametrize("names", [['ip4'],
                                    ['ip4', 'tcp'],
-                                   ['ip4', 'tcp', 'udp']])
+                                   ['ip4', 'tcp', 'udp'],
+                                   ['p2p-circuit', 'tcp']])
 def test_protocols_with_string(names):
     expected = [protocols.protocol_with_name(name) for name in names]
     ins = "/".join(names)
@@ -114,6 +115,17 @@ def test_protocols_with_string(names):
     assert protocols.protocols_with_string("/" + ins + "/") == expected
 
 
+@pytest.mark.parametrize("string", ["/udp/quic-v1", "/ip4/p2p-circuit"])
+def test_protocols_with_string_rejects_name_as_value(string):
+    with pytest.raises(exceptions.StringParseError, match="Invalid value for protocol"):
+        protocols.protocols_with_string(string)
+
+
+@pytest.mark.parametrize("string", ["/unix/tmp/p2p.sock", "unix/a/b/c", "/unix//a/ip4/"])
+def test_protocols_with_string_unix_path(string):
+    assert protocols.protocols_with_string(string) == [protocols.protocol_with_name("unix")]
+
+
 @pytest.mark.parametrize("invalid_name", ["", "/", "//"])
 def test_protocols_with_string_invalid(invalid_name):
     assert protocols.protocols_with_string(invalid_name) == []
@@ -3,12 +3,13 @@
 import sys
 from unittest.mock import AsyncMock, patch
 
+import dns.asyncresolver
 import dns.resolver
 import pytest
 import trio
 
 from multiaddr import Multiaddr
-from multiaddr.exceptions import RecursionLimitError
+from multiaddr.exceptions import RecursionLimitError, ResolutionError
 from multiaddr.resolvers import DNSResolver
 
 if sys.version_info >= (3, 11):
@@ -125,6 +126,309 @@ async def test_resolve_recursive_dns_addr(dns_resolver, mock_dns_resolution):
         assert result[0].value_for_protocol(result[0].protocols()[0].code) == "127.0.0.1"
 
 
+@pytest.mark.trio
+async def test_resolve_dns_queries_a_and_aaaa_concurrently(dns_resolver, mock_dns_resolution):
+    """Test that /dns issues A and AAAA together and keeps IPv4 results first."""
+    mock_rdata_aaaa = AsyncMock()
+    mock_rdata_aaaa.address = "::1"
+    mock_dns_resolution["mock_answer_aaaa"].__iter__.return_value = [mock_rdata_aaaa]
+    in_flight = []
+
+    async def slow_resolve(hostname, record_type):
+        in_flight.append(record_type)
+        # Both queries must be outstanding before either answers
+        while len(in_flight) < 2:
+            await trio.sleep(0.01)
+        return await mock_dns_resolution["mock_resolve_side_effect"](hostname, record_type)
+
+    with patch.object(dns_resolver._resolver, "resolve", side_effect=slow_resolve):
+        with trio.fail_after(1):
+            result = await dns_resolver.resolve(Multiaddr("/dns/example.com/tcp/80"))
+
+    assert sorted(in_flight) == ["A", "AAAA"]
+    assert result == [Multiaddr("/ip4/127.0.0.1/tcp/80"), Multiaddr("/ip6/::1/tcp/80")]
+
+
+@pytest.mark.trio
+async def test_resolve_dns_reports_query_errors_like_dns4(dns_resolver):
+    """Test that /dns surfaces the underlying lookup error, not an exception group."""
+    with patch.object(dns_resolver._resolver, "resolve", side_effect=dns.resolver.NoNameservers):
+        with pytest.raises(ResolutionError) as dns_error:
+            await dns_resolver.resolve(Multiaddr("/dns/example.com/tcp/80"))
+        with pytest.raises(ResolutionError) as dns4_error:
+            await dns_resolver.resolve(Multiaddr("/dns4/example.com/tcp/80"))
+
+    assert str(dns_error.value) == str(dns4_error.value)
+    assert "sub-exception" not in str(dns_error.value)
+
+
+@pytest.mark.trio
+async def test_resolve_caches_answers(dns_resolver, mock_dns_resolution):
+    """Test that repeated lookups, including missing records, are served from the cache."""
+
+    async def side_effect(hostname, record_type):
+        if hostname == "_dnsaddr.missing.example.com":
+            raise dns.resolver.NXDOMAIN()
+        return await mock_dns_resolution["mock_resolve_side_effect"](hostname, record_type)
+
+    with patch.object(dns_resolver._resolver, "resolve", side_effect=side_effect) as mock_resolve:
+        for _ in range(3):
+            result = await dns_resolver.resolve(Multiaddr("/dns4/Example.com/tcp/80"))
+            assert result == [Multiaddr("/ip4/127.0.0.1/tcp/80")]
+            assert await dns_resolver.resolve(Multiaddr("/dnsaddr/missing.example.com")) == []
+        assert mock_resolve.call_count == 2
+
+        dns_resolver.clear_cache()
+        await dns_resolver.resolve(Multiaddr("/dns4/example.com/tcp/80"))
+        assert mock_resolve.call_count == 3
+
+
+@pytest.mark.trio
+async def test_multiaddr_resolve_does_not_share_a_cache(mock_dns_resolution):
+    """Test that Multiaddr.resolve() uses a fresh resolver for every call."""
+    ma = Multiaddr("/dns4/example.com/tcp/80")
+    side_effect = mock_dns_resolution["mock_resolve_side_effect"]
+    with patch.object(
+        dns.asyncresolver.Resolver, "resolve", side_effect=side_effect
+    ) as mock_resolve:
+        assert await ma.resolve() == [Multiaddr("/ip4/127.0.0.1/tcp/80")]
+        assert await ma.resolve() == [Multiaddr("/ip4/127.0.0.1/tcp/80")]
+        assert mock_resolve.call_count == 2
+
+
+@pytest.mark.trio
+async def test_negative_cache_raises_fresh_exceptions(dns_resolver):
+    """Test that each hit on a cached missing record raises its own exception."""
+    side_effect = AsyncMock(side_effect=dns.resolver.NXDOMAIN())
+    with patch.object(dns_resolver._resolver, "resolve", side_effect=side_effect):
+        errors = []
+        for _ in range(3):
+            with pytest.raises(dns.resolver.NXDOMAIN) as exc_info:
+                await dns_resolver._query("missing.example.com", "A")
+            errors.append(exc_info.value)
+        assert side_effect.call_count == 1
+        assert errors[1] is not errors[0] and errors[2] is not errors[1]
+
+
+@pytest.mark.trio
+async def test_resolve_cache_honours_record_ttl(dns_resolver, mock_dns_resolution):
+    """Test that an answer is not reused for longer than its record TTL."""
+    ma = Multiaddr("/dns4/example.com/tcp/80")
+    side_effect = mock_dns_resolution["mock_resolve_side_effect"]
+    with patch.object(dns_resolver._resolver, "resolve", side_effect=side_effect) as mock_resolve:
+        mock_dns_resolution["mock_answer_a"].rrset.ttl = 0
+        await dns_resolver.resolve(ma)
+        await dns_resolver.resolve(ma)
+        assert mock_resolve.call_count == 2
+
+        dns_resolver.clear_cache()
+        mock_dns_resolution["mock_answer_a"].rrset.ttl = 3600
+        await dns_resolver.resolve(ma)
+        await dns_resolver.resolve(ma)
+        assert mock_resolve.call_count == 3
+        assert dns_resolver._answer_ttl(mock_dns_resolution["mock_answer_a"]) == 300.0
+
+
+@pytest.mark.trio
+async def test_resolve_serves_stale_answer_on_failure(dns_resolver, mock_dns_resolution):
+    """Test that an expired answer is used when refreshing it fails, if enabled."""
+    ma = Multiaddr("/dns4/example.com/tcp/80")
+    dns_resolver.CACHE_TTL = 0.0
+    side_effect = mock_dns_resolution["mock_resolve_side_effect"]
+    with patch.object(dns_resolver._resolver, "resolve", side_effect=side_effect):
+        await dns_resolver.resolve(ma)
+    with patch.object(dns_resolver._resolver, "resolve", side_effect=dns.resolver.NoNameservers):
+        with pytest.raises(ResolutionError):
+            await dns_resolver.resolve(ma)
+
+    dns_resolver = DNSResolver(serve_stale=True)
+    dns_resolver.CACHE_TTL = 0.0
+    with patch.object(dns_resolver._resolver, "resolve", side_effect=side_effect):
+        expected = await dns_resolver.resolve(ma)
+    with patch.object(dns_resolver._resolver, "resolve", side_effect=dns.resolver.NoNameservers):
+        assert await dns_resolver.resolve(ma) == expected
+
+    dns_resolver.clear_cache()
+    with patch.object(dns_resolver._resolver, "resolve", side_effect=dns.resolver.NoNameservers):
+        with pytest.raises(ResolutionError):
+            await dns_resolver.resolve(ma)
+
+
+@pytest.mark.trio
+async def test_resolve_serves_stale_answer_when_server_hangs(mock_dns_resolution):
+    """Test that a hanging refresh falls back to the stale answer before the timeout."""
+    ma = Multiaddr("/dns4/example.com/tcp/80")
+    dns_resolver = DNSResolver(serve_stale=True)
+    dns_resolver.CACHE_TTL = 0.0
+    dns_resolver.STALE_REFRESH_TIMEOUT = 0.05
+    side_effect = mock_dns_resolution["mock_resolve_side_effect"]
+    with patch.object(dns_resolver._resolver, "resolve", side_effect=side_effect):
+        expected = await dns_resolver.resolve(ma)
+
+    async def hung_resolve(*args, **kwargs):
+        await trio.sleep_forever()
+
+    with patch.object(dns_resolver._resolver, "resolve", side_effect=hung_resolve):
+        with trio.fail_after(1):
+            assert await dns_resolver.resolve(ma) == expected
+
+
+@pytest.mark.trio
+async def test_resolve_dnsaddr_recurses_concurrently(dns_resolver):
+    """Test that nested dnsaddr entries resolve together and keep the TXT record order."""
+    txt_answer = []
+    for name in ("a", "b"):
+        rdata = AsyncMock()
+        rdata.strings = [f"dnsaddr=/dns4/{name}.example.com/tcp/4001"]
+        txt_answer.append(rdata)
+    in_flight = []
+
+    async def slow_resolve(hostname, record_type):
+        if record_type == "TXT":
+            return txt_answer
+        in_flight.append(hostname)
+        # Both nested lookups must be outstanding before either answers
+        while len(in_flight) < 2:
+            await trio.sleep(0.01)
+        rdata = AsyncMock()
+        rdata.address = "10.0.0.1" if hostname.startswith("a.") else "10.0.0.2"
+        return [rdata]
+
+    with patch.object(dns_resolver._resolver, "resolve", side_effect=slow_resolve):
+        with trio.fail_after(1):
+            result = await dns_resolver.resolve(Multiaddr("/dnsaddr/example.com"))
+
+    assert sorted(in_flight) == ["a.example.com", "b.example.com"]
+    assert result == [
+        Multiaddr("/ip4/10.0.0.1/tcp/4001"),
+        Multiaddr("/ip4/10.0.0.2/tcp/4001"),
+    ]
+
+
+@pytest.mark.trio
+async def test_resolve_dnsaddr_bounds_concurrent_lookups(dns_resolver):
+    """Test that a TXT record with many nested entries does not start them all at once."""
+    dns_resolver.DNSADDR_CONCURRENCY = 3
+    txt_answer = []
+    for n in range(20):
+        rdata = AsyncMock()
+        rdata.strings = [f"dnsaddr=/dns4/host{n}.example.com/tcp/4001"]
+        txt_answer.append(rdata)
+    active = 0
+    peak = 0
+
+    async def slow_resolve(hostname, record_type):
+        nonlocal active, peak
+        if record_type == "TXT":
+            return txt_answer
+        active += 1
+        peak = max(peak, active)
+        await trio.sleep(0.01)
+        active -= 1
+        rdata = AsyncMock()
+        rdata.address = "10.0.0.1"
+        return [rdata]
+
+    with patch.object(dns_resolver._resolver, "resolve", side_effect=slow_resolve):
+        with trio.fail_after(1):
+            result = await dns_resolver.resolve(Multiaddr("/dnsaddr/example.com"))
+
+    assert peak == 3
+    assert result == [Multiaddr("/ip4/10.0.0.1/tcp/4001")]
+
+
+@pytest.mark.trio
+async def test_resolve_coalesces_concurrent_lookups(dns_resolver, mock_dns_resolution):
+    """Test that concurrent resolutions of one name share a single query."""
+    calls = []
+
+    async def slow_resolve(hostname, record_type):
+        calls.append((hostname, record_type))
+        await trio.sleep(0.05)
+        return await mock_dns_resolution["mock_resolve_side_effect"](hostname, record_type)
+
+    results = []
+
+    async def resolve_one():
+        results.append(await dns_resolver.resolve(Multiaddr("/dns4/example.com/tcp/80")))
+
+    with patch.object(dns_resolver._resolver, "resolve", side_effect=slow_resolve):
+        async with trio.open_nursery() as nursery:
+            for _ in range(5):
+                nursery.start_soon(resolve_one)
+
+    assert calls == [("example.com", "A")]
+    assert results == [[Multiaddr("/ip4/127.0.0.1/tcp/80")]] * 5
+    assert not dns_resolver._inflight
+
+
+@pytest.mark.trio
+async def test_coalesced_lookup_failures_raise_separate_exceptions(dns_resolver):
+    """Test that tasks sharing a failed lookup do not share the exception object."""
+
+    async def failing_resolve(hostname, record_type):
+        await trio.sleep(0.05)
+        raise dns.resolver.NoNameservers()
+
+    errors = []
+
+    async def query_one():
+        try:
+            await dns_resolver._query("example.com", "A")
+        except Exception as e:
+            errors.append(e)
+
+    with patch.object(dns_resolver._resolver, "resolve", side_effect=failing_resolve):
+        async with trio.open_nursery() as nursery:
+            for _ in range(3):
+                nursery.start_soon(query_one)
+
+    assert len(errors) == 3
+    assert len({id(e) for e in errors}) == 3
+    assert {type(e) for e in errors} == {dns.resolver.NoNameservers}
+    assert len({str(e) for e in errors}) == 1
+
+
+def test_inflight_lookups_are_scoped_to_a_trio_run(dns_resolver):
+    """Test that lookups in progress are not shared across trio runs."""
+    seen = []
+
+    async def record_inflight():
+        seen.append(dns_resolver._inflight)
+        seen[-1][("example.com", "A")] = (trio.Event(), [])
+
+    trio.run(record_inflight)
+    trio.run(record_inflight)
+    assert seen[0] is not seen[1]
+    assert list(seen[1]) == [("example.com", "A")]
+
+
+@pytest.mark.trio
+async def test_resolve_dnsaddr_drops_duplicate_addresses(dns_resolver):
+    """Test that dnsaddr entries leading to the same address are reported once."""
+    txt_answer = []
+    for entry in (
+        "/dns4/a.example.com/tcp/4001",
+        "/ip4/10.0.0.1/tcp/4001",
+        "/ip4/10.0.0.2/tcp/4001",
+    ):
+        rdata = AsyncMock()
+        rdata.strings = [f"dnsaddr={entry}"]
+        txt_answer.append(rdata)
+
+    async def resolve(hostname, record_type):
+        if record_type == "TXT":
+            return txt_answer
+        rdata = AsyncMock()
+        rdata.address = "10.0.0.1"
+        return [rdata]
+
+    with patch.object(dns_resolver._resolver, "resolve", side_effect=resolve):
+        result = await dns_resolver.resolve(Multiaddr("/dnsaddr/example.com"))
+
+    assert result == [Multiaddr("/ip4/10.0.0.1/tcp/4001"), Multiaddr("/ip4/10.0.0.2/tcp/4001")]
+
+
 @pytest.mark.trio
 async def test_resolve_recursion_limit(dns_resolver):
     """Test that recursion limit is enforced."""
@@ -143,6 +447,21 @@ async def test_resolve_dns_addr_error(dns_resolver):
         assert result == []
 
 
+@pytest.mark.trio
+@pytest.mark.parametrize("addr", ["/dns4/example.com/tcp/80", "/dnsaddr/example.com"])
+async def test_resolve_times_out_without_signal(dns_resolver, addr):
+    """Test that lookups without a signal fail after DEFAULT_TIMEOUT."""
+    dns_resolver.DEFAULT_TIMEOUT = 0.05
+
+    async def hung_resolve(*args, **kwargs):
+        await trio.sleep_forever()
+
+    with patch.object(dns_resolver._resolver, "resolve", side_effect=hung_resolve):
+        with trio.fail_after(1), pytest.raises(ResolutionError) as exc_info:
+            await dns_resolver.resolve(Multiaddr(addr))
+    assert str(exc_info.value).endswith("timed out after 0.05 seconds")
+
+
 @pytest.mark.trio
 async def test_resolve_dns_addr_with_quotes(dns_resolver, mock_dns_resolution):
     """Test resolving DNS records with quoted strings."""
@@ -201,7 +520,6 @@ async def test_resolve_cancellation_with_error():
     """Test that DNS resolution can be cancelled."""
     ma = Multiaddr("/dnsaddr/nonexistent.example.com")
     signal = trio.CancelScope()  # type: ignore[call-arg]
-    signal.cancelled_caught = True
     dns_resolver = DNSResolver()
 
     # Mock the DNS resolver to simulate a slow lookup that can be cancelled
@@ -224,3 +542,19 @@ async def test_resolve_cancellation_with_error():
 
         # Verify that the signal was actually cancelled
         assert signal.cancel_called
+        assert signal.cancelled_caught
+
+
+@pytest.mark.trio
+@pytest.mark.parametrize("addr", ["/dns4/example.com/tcp/80", "/dnsaddr/example.com"])
+async def test_resolve_cancelled_signal_returns_empty(dns_resolver, addr):
+    """Test that a lookup cancelled through its signal resolves to no addresses."""
+    signal = trio.CancelScope()  # type: ignore[call-arg]
+    signal.cancel()
+
+    async def hung_resolve(*args, **kwargs):
+        await trio.sleep_forever()
+
+    with patch.object(dns_resolver._resolver, "resolve", side_effect=hung_resolve):
+        assert await dns_resolver.resolve(Multiaddr(addr), {"signal": signal}) == []
+    assert signal.cancelled_caught
@@ -1,8 +1,16 @@
+import socket
+from types import SimpleNamespace
+from unittest.mock import patch
+
 import pytest
 
 from multiaddr import Multiaddr
 from multiaddr.exceptions import StringParseError
-from multiaddr.utils import get_thin_waist_addresses
+from multiaddr.utils import (
+    get_network_addrs,
+    get_thin_waist_addresses,
+    invalidate_interface_cache,
+)
 
 
 def test_no_address():
@@ -70,3 +78,25 @@ def test_ipv6_wildcard_override_port():
         assert s.startswith("/ip6/")
         assert "/tcp/100" in s
         assert not s.startswith("/ip6/::")
+
+
+def test_network_addrs_cached():
+    ifaddrs = {
+        "eth0": [
+            SimpleNamespace(family=socket.AF_INET, address="10.0.0.5"),
+            SimpleNamespace(family=socket.AF_INET6, address="2001:db8::5%eth0"),
+        ]
+    }
+    invalidate_interface_cache()
+    try:
+        with patch("multiaddr.utils.psutil.net_if_addrs", return_value=ifaddrs) as mock:
+            assert get_network_addrs(4) == ["10.0.0.5"]
+            assert get_network_addrs(4) == ["10.0.0.5"]
+            assert get_network_addrs(6) == ["2001:db8::5"]
+            assert mock.call_count == 1
+
+            invalidate_interface_cache()
+            assert get_network_addrs(4) == ["10.0.0.5"]
+            assert mock.call_count == 2
+    finally:
+        invalidate_interface_cache()
@@ -2,14 +2,27 @@
 
 import io
 
+import cid
+import idna
 import pytest
+import varint
 
 import multiaddr.protocols
 from multiaddr.codecs import CODEC_CACHE, CodecBase, codec_by_name
+from multiaddr.codecs.cid import _is_binary_cidv0_multihash
+from multiaddr.codecs.domain import _is_ldh_name
 from multiaddr.exceptions import BinaryParseError, StringParseError
 from multiaddr.multiaddr import Multiaddr
 from multiaddr.protocols import REGISTRY, Protocol
-from multiaddr.transforms import bytes_iter, bytes_to_string, size_for_addr, string_to_bytes
+from multiaddr.transforms import (
+    _read_varint,
+    _write_varint,
+    _write_varint_into,
+    bytes_iter,
+    bytes_to_string,
+    size_for_addr,
+    string_to_bytes,
+)
 
 # These test values were generated by running them through the go implementation
 # of multiaddr (https://github.com/multiformats/go-multiaddr)
@@ -77,6 +90,7 @@ BYTES_MAP_STR_TEST_DATA = [
         "/ip4/127.0.0.1/udp/1234/ip4/127.0.0.1/tcp/4321",
         b"\x04\x7f\x00\x00\x01\x91\x02\x04\xd2\x04\x7f\x00\x00\x01\x06\x10\xe1",
     ),
+    ("/ip4/127.0.0.1/udp/1234/utp", b"\x04\x7f\x00\x00\x01\x91\x02\x04\xd2\xae\x02"),
 ]
 
 
@@ -172,6 +186,42 @@ def protocol_extension(monkeypatch):
     monkeypatch.setattr(multiaddr.protocols, "REGISTRY", registry)
 
 
+def test_bytes_to_string_accepts_bytearray():
+    # The p2p value is a CIDv1, which goes through the cid codec's parse caches
+    buf = string_to_bytes(
+        "/ip4/127.0.0.1/tcp/4001/p2p/bafzbeigvf25ytwc3akrijfecaotc74udrhcxzh2cx3we5qqnw5vgrei4bm"
+    )
+    assert bytes_to_string(bytearray(buf)) == bytes_to_string(buf)
+    assert bytes_to_string(bytearray(buf)).endswith(
+        "/p2p/QmcgpsyWgH8Y8ajJz1Cu72KnS5uo2Aa2LpzU7kinSupNKC"
+    )
+
+
+def test_parse_caches_follow_registry(monkeypatch):
+    string = "/ip4/127.0.0.1/tcp/80"
+    buf = string_to_bytes(string)
+    assert bytes_to_string(buf) == string
+    assert bytes_to_string(bytearray(buf)) == string
+
+    monkeypatch.setattr(multiaddr.protocols, "REGISTRY", multiaddr.protocols.ProtocolRegistry())
+    with pytest.raises(StringParseError):
+        string_to_bytes(string)
+    with pytest.raises(BinaryParseError):
+        bytes_to_string(buf)
+
+
+def test_parse_error_args_include_context():
+    exc = StringParseError("bad value", "/ip4/x", "ip4")
+    assert exc.message == "bad value"
+    assert exc.args == ("Invalid MultiAddr '/ip4/x' protocol ip4: bad value",)
+    assert repr(exc) == "StringParseError(\"Invalid MultiAddr '/ip4/x' protocol ip4: bad value\")"
+
+    exc = BinaryParseError("bad value", b"\x04", "ip4")
+    assert exc.message == "bad value"
+    assert exc.args == ("Invalid binary MultiAddr protocol ip4: bad value",)
+    assert repr(exc) == "BinaryParseError('Invalid binary MultiAddr protocol ip4: bad value')"
+
+
 @pytest.mark.parametrize("string", ["test", "/ip4/", "/unparsable/5"])
 def test_string_to_bytes_value_error(protocol_extension, string):
     with pytest.raises(StringParseError):
@@ -211,6 +261,7 @@ def test_codec_to_bytes_value_error(proto, address):
     "proto, buf",
     [
         (REGISTRY.find("tcp"), b"\xff\xff\xff\xff"),
+        (REGISTRY.find("ip4"), b"\x7f\x00\x01"),
         (REGISTRY.find("ip6zone"), b""),
     ],
 )
@@ -234,3 +285,99 @@ def test_codec_to_string_value_error(proto, buf):
 )
 def test_cid_autoconvert_to_string(proto, buf, expected):
     assert codec_by_name("cid").to_string(proto, buf) == expected
+
+
+@pytest.mark.parametrize(
+    "string",
+    [
+        "12D3KooWNvSZnPi3RrhrTwEY4LuuBeB6K6facKUCJcyWG1aoDd2p",  # identity, leading "1"
+        "QmcgpsyWgH8Y8ajJz1Cu72KnS5uo2Aa2LpzU7kinSupNKC",  # sha2-256, leading "Qm"
+        "bafzbeigvf25ytwc3akrijfecaotc74udrhcxzh2cx3we5qqnw5vgrei4bm",  # CIDv1
+    ],
+)
+def test_cid_to_bytes_matches_py_cid(string):
+    # No multibase prefix is "1" or "Q", so strings starting that way are only
+    # ever base58 multihashes; the single base58 decode must agree with py-cid
+    expected = cid.make_cid(string).buffer
+    assert codec_by_name("cid").to_bytes(REGISTRY.find("p2p"), string) == expected
+
+
+@pytest.mark.parametrize(
+    "buf, expected",
+    [
+        (b"\x12\x20" + b"\x00" * 32, True),  # sha2-256
+        (b"\x00\x24" + b"\x00" * 36, True),  # identity
+        (b"\x12\x14" + b"\x00" * 20, False),  # sha2-256 with a truncated digest
+        (b"\x12\x20" + b"\x00" * 31, False),  # length mismatch
+        (b"\x00\x24" + b"\x00" * 35, False),  # length mismatch
+        (b"\x01\x72\x00\x24", False),  # CIDv1 prefix
+        (b"\x12", False),
+        (b"", False),
+    ],
+)
+def test_is_binary_cidv0_multihash(buf, expected):
+    assert _is_binary_cidv0_multihash(buf) is expected
+
+
+@pytest.mark.parametrize("n", [0, 1, 0x7F, 0x80, 0x3FFF, 0x4000, 0x1FFFFF, 2**35])
+def test_write_varint(n):
+    assert _write_varint(n) == varint.encode(n)
+    out = bytearray(b"x")
+    _write_varint_into(out, n)
+    assert out == b"x" + varint.encode(n)
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("example.com", True),
+        ("EXAMPLE.com", True),
+        ("a" * 63 + ".com", True),
+        ("a" * 64 + ".com", False),
+        ("ab--c.com", False),
+        ("xn--nxasmq6b.com", False),  # A-labels are left to IDNA
+        ("-a.com", False),
+        ("a..com", False),
+        ("_dnsaddr.example.com", False),
+        ("exämple.com", False),
+    ],
+)
+def test_domain_ldh_fast_path(name, expected):
+    assert _is_ldh_name(name) is expected
+    if expected:
+        idna.encode(name, uts46=True)
+
+
+@pytest.mark.parametrize("n", [0, 1, 0x7F, 0x80, 0x3FFF, 0x4000, 0x1FFFFF, 2**35])
+def test_read_varint(n):
+    encoded = varint.encode(n)
+    assert _read_varint(b"\xff" + encoded + b"\x01", 1) == (n, 1 + len(encoded))
+    with pytest.raises(EOFError):
+        _read_varint(encoded[:-1], 0)
+
+
+@pytest.mark.parametrize(
+    "proto, string",
+    [
+        ("tcp", "0"),
+        ("tcp", "65535"),
+        ("tcp", "65536"),
+        ("tcp", "-1"),
+        ("tcp", "port"),
+        ("ip6", "::1"),
+        ("ip6", "1.2.3.4"),
+        ("ip4", "1.2.3.4"),
+        ("ip4", "1.2.3"),
+    ],
+)
+def test_codec_validate_matches_to_bytes(proto, string):
+    proto = REGISTRY.find(proto)
+    codec = codec_by_name(proto.codec)
+    error = codec.validate(proto, string)
+    try:
+        codec.to_bytes(proto, string)
+    except Exception as exc:
+        assert type(error) is type(exc)
+        assert str(error) == str(exc)
+    else:
+        assert error is None